@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-08-27 20:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0002_bookproject_owner'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bookproject',
+            index=models.Index(fields=['owner', '-created_at'], name='bp_owner_created_idx'),
+        ),
+    ]
@@ -46,6 +46,10 @@ class BookProject(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Project listings filter by owner and order by newest first.
+            models.Index(fields=["owner", "-created_at"], name="bp_owner_created_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.title} ({self.id})"
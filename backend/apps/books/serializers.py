@@ -29,6 +29,13 @@ class ChapterSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "updated_at", "vector_indexed"]
 
 
+class ChapterListSerializer(ChapterSerializer):
+    """Chapter rows without the content body, for list endpoints."""
+
+    class Meta(ChapterSerializer.Meta):
+        fields = [field for field in ChapterSerializer.Meta.fields if field != "content"]
+
+
 class SourceDocumentSerializer(serializers.ModelSerializer):
     def validate_project(self, value):
         request = self.context.get("request")
@@ -51,9 +58,18 @@ class SourceDocumentSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "updated_at"]
 
 
+class SourceDocumentListSerializer(SourceDocumentSerializer):
+    """Source rows without the extracted text, for list endpoints."""
+
+    class Meta(SourceDocumentSerializer.Meta):
+        fields = [field for field in SourceDocumentSerializer.Meta.fields if field != "content"]
+
+
 class BookProjectSerializer(serializers.ModelSerializer):
-    chapters = ChapterSerializer(many=True, read_only=True)
-    sources = SourceDocumentSerializer(many=True, read_only=True)
+    # Slim nested rows: project payloads list chapters/sources for overview;
+    # bodies come from the dedicated chapter/source endpoints.
+    chapters = ChapterListSerializer(many=True, read_only=True)
+    sources = SourceDocumentListSerializer(many=True, read_only=True)
     owner = serializers.PrimaryKeyRelatedField(read_only=True)
 
     class Meta:
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import io
 import logging
 import re
 from pathlib import Path
@@ -29,16 +28,17 @@ def extract_knowledge_text(uploaded_file) -> Dict[str, str]:
     if ext not in SUPPORTED_KB_EXTENSIONS:
         raise ValueError("Unsupported file type. Use .txt, .md, .pdf, .docx, or .doc")
 
-    raw = uploaded_file.read()
-    if not raw:
+    if not getattr(uploaded_file, "size", None):
         raise ValueError("Uploaded file is empty")
 
     if ext in {".txt", ".md"}:
-        text = _decode_text(raw)
+        text = _decode_text(uploaded_file.read())
     elif ext == ".pdf":
-        text = _extract_pdf_text(raw)
+        # Parsers read the upload directly (disk-backed for large files),
+        # so the raw bytes are never duplicated into a Python string first.
+        text = _extract_pdf_text(uploaded_file)
     elif ext == ".docx":
-        text = _extract_docx_text(raw)
+        text = _extract_docx_text(uploaded_file)
     elif ext == ".doc":
         # Legacy .doc parsing is unreliable without external system tools.
         # We explicitly guide users to a modern format for robust extraction.
@@ -90,23 +90,34 @@ def _decode_text(raw: bytes) -> str:
     return raw.decode("utf-8", errors="ignore")
 
 
-def _extract_pdf_text(raw: bytes) -> str:
+def _extract_pdf_text(file_obj) -> str:
     if PdfReader is None:
         raise ValueError("PDF parsing dependency is unavailable. Install pypdf.")
-    reader = PdfReader(io.BytesIO(raw))
+    reader = PdfReader(file_obj)
     pages = []
+    total = 0
     for page in reader.pages:
-        pages.append(page.extract_text() or "")
+        chunk = page.extract_text() or ""
+        pages.append(chunk)
+        total += len(chunk)
+        # The result is truncated to MAX_KB_TEXT_CHARS anyway; stop
+        # extracting once the budget is covered.
+        if total >= MAX_KB_TEXT_CHARS:
+            break
     return "\n\n".join(pages)
 
 
-def _extract_docx_text(raw: bytes) -> str:
-    document = Document(io.BytesIO(raw))
+def _extract_docx_text(file_obj) -> str:
+    document = Document(file_obj)
     blocks = []
+    total = 0
     for paragraph in document.paragraphs:
         text = (paragraph.text or "").strip()
         if text:
             blocks.append(text)
+            total += len(text)
+            if total >= MAX_KB_TEXT_CHARS:
+                break
     return "\n\n".join(blocks)
 
 
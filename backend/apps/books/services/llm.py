@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import re
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 from django.conf import settings
+from django.core.cache import cache
 
 from ..models import BookProject
 
@@ -117,7 +120,7 @@ _JSON_RULE = (
     "no prose before or after, no trailing commas, no comments."
 )
 
-_PROFILE_FIELD_ORDER = [
+_PROFILE_FIELD_ORDER = (
     # Natural conversational flow (not UI form order)
     "title",
     "audience",
@@ -146,9 +149,9 @@ _PROFILE_FIELD_ORDER = [
     "richElements",
     "subtitle",
     "primaryCta",
-]
+)
 
-_REQUIRED_PROFILE_FIELDS = [
+_REQUIRED_PROFILE_FIELDS = (
     "title",
     "genre",
     "language",
@@ -163,13 +166,17 @@ _REQUIRED_PROFILE_FIELDS = [
     "sentenceRhythm",
     "vocabularyLevel",
     "chapterLength",
-]
+)
 
-_OPTIONAL_PROFILE_FIELDS = [
-    field for field in _PROFILE_FIELD_ORDER if field not in _REQUIRED_PROFILE_FIELDS
-]
+# Frozenset companions for the membership tests on the per-turn path.
+_PROFILE_FIELD_SET = frozenset(_PROFILE_FIELD_ORDER)
+_REQUIRED_PROFILE_FIELD_SET = frozenset(_REQUIRED_PROFILE_FIELDS)
+
+_OPTIONAL_PROFILE_FIELDS = tuple(
+    field for field in _PROFILE_FIELD_ORDER if field not in _REQUIRED_PROFILE_FIELD_SET
+)
 
-_LATE_OPTIONAL_BATCH_FIELDS = [
+_LATE_OPTIONAL_BATCH_FIELDS = (
     "customInstructions",
     "contentBoundaries",
     "booksToEmulate",
@@ -179,7 +186,7 @@ _LATE_OPTIONAL_BATCH_FIELDS = [
     "richElements",
     "subtitle",
     "primaryCta",
-]
+)
 
 _PROFILE_CONVERSATION_GUIDANCE = (
     "Prefer a natural consultant-style flow rather than UI/form order. "
@@ -249,6 +256,15 @@ class LLMService:
     callers never need to branch on None.
     """
 
+    _shared: Optional["LLMService"] = None
+
+    @classmethod
+    def get_shared(cls) -> "LLMService":
+        """Lazily built process-wide instance for callers that need no isolation."""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
     def __init__(self) -> None:
         self.model = settings.OPENAI_MODEL
         self.fast_model = getattr(settings, "OPENAI_FAST_MODEL", self.model)
@@ -329,16 +345,19 @@ class LLMService:
             schema=_OUTLINE_SCHEMA,
         )
 
+        # Stable-per-project sections lead and the per-call feedback/outline
+        # trail, so provider-side prompt caching can reuse the long prefix
+        # across successive refine rounds.
         user_prompt = _join(
             _book_header(project),
             _profile_block(project),
             _refine_non_negotiables_block(project),
+            _section("Revision Guidelines", _REFINE_GUIDELINES),
             _section("Editorial Feedback", feedback),
             _section(
                 "Existing Outline",
                 json.dumps(existing_outline, ensure_ascii=False, indent=2),
             ),
-            _section("Revision Guidelines", _REFINE_GUIDELINES),
             _knowledge_block(knowledge_text),
         )
 
@@ -637,6 +656,24 @@ class LLMService:
         user_message: str,
     ) -> Dict[str, Any]:
         profile = current_profile if isinstance(current_profile, dict) else {}
+        recent_conversation = (conversation or [])[-20:]
+        cache_key = None
+        try:
+            # Exact-match memo: retried or double-submitted turns recur with
+            # identical inputs, and both the prompt and the normalizer only
+            # look at the last 20 turns, so this tail fully determines output.
+            fingerprint = json.dumps(
+                [str(project.pk), _project_profile_dict(project), profile, recent_conversation, user_message],
+                sort_keys=True,
+                separators=(",", ":"),
+                default=str,
+            )
+            cache_key = "assist_profile:" + hashlib.blake2b(fingerprint.encode("utf-8"), digest_size=16).hexdigest()
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+        except TypeError:
+            cache_key = None
         confirmed_profile, form_defaults = _split_profile_confirmed_and_defaults(profile)
         transcript_lines: List[str] = []
         for turn in (conversation or [])[-20:]:
@@ -711,7 +748,11 @@ class LLMService:
 
         payload = self._call_json(system_prompt, user_prompt)
         if payload:
-            return self._normalize_assistant_payload(payload, profile, user_message, conversation or [])
+            normalized = self._normalize_assistant_payload(payload, profile, user_message, conversation or [])
+            if cache_key is not None:
+                cache.set(cache_key, normalized, timeout=600)
+            return normalized
+        # Fallbacks are cheap and may recover next turn; don't pin them.
         return self._fallback_profile_assistant(profile, user_message)
 
     def embed(self, text: str) -> Optional[List[float]]:
@@ -729,6 +770,30 @@ class LLMService:
             logger.warning("Embedding call failed", exc_info=True)
         return None
 
+    def embed_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Embed several texts in a single provider round trip.
+
+        Returns one vector (or None on failure) per input text, in order.
+        """
+        if not texts:
+            return []
+        if not self._client:
+            return [None] * len(texts)
+        try:
+            response = self._client.embeddings.create(
+                model=settings.OPENAI_EMBED_MODEL,
+                input=[str(text)[:12000] for text in texts],
+            )
+            vectors: List[Optional[List[float]]] = [None] * len(texts)
+            for item in response.data:
+                vec = item.embedding
+                if isinstance(vec, list) and vec:
+                    vectors[item.index] = vec
+            return vectors
+        except Exception:
+            logger.warning("Batch embedding call failed", exc_info=True)
+        return [None] * len(texts)
+
     # ------------------------------------------------------------------
     # Private — API layer
     # ------------------------------------------------------------------
@@ -799,7 +864,7 @@ class LLMService:
         if isinstance(raw_updates, dict):
             for key, value in raw_updates.items():
                 field = str(key).strip()
-                if field in _PROFILE_FIELD_ORDER:
+                if field in _PROFILE_FIELD_SET:
                     updates[field] = _normalize_profile_value(field, value)
 
         updates = _sanitize_assistant_updates(
@@ -836,20 +901,31 @@ class LLMService:
             model_missing = [
                 str(item).strip()
                 for item in raw_missing
-                if str(item).strip() in _REQUIRED_PROFILE_FIELDS and str(item).strip() in computed_missing_set
+                if str(item).strip() in _REQUIRED_PROFILE_FIELD_SET and str(item).strip() in computed_missing_set
             ]
         missing_required = _ordered_unique_fields(model_missing + computed_missing)
 
         next_field_raw = str(payload.get("next_field", "")).strip()
-        next_field = next_field_raw if next_field_raw in _PROFILE_FIELD_ORDER else ""
+        next_field = next_field_raw if next_field_raw in _PROFILE_FIELD_SET else ""
         reply = str(payload.get("assistant_reply", "")).strip()
-        finalize_intent = _is_finalize_intent(user_message)
-        defaults_acceptance_intent = _is_defaults_acceptance_intent(user_message)
-        wants_more_optional_details = _wants_more_optional_details(user_message)
-        explanation_field = _field_explanation_request_field(user_message)
-        field_label_reference = _field_label_reference_field(user_message)
-        pause_intent = _is_pause_or_rest_intent(user_message)
-        off_topic_intent = _is_off_topic_or_out_of_scope(user_message)
+        short_intents = _SHORT_ACK_INTENTS.get(_normalize_for_match(user_message))
+        if short_intents is not None:
+            # Common one-liners ("ok", "finalize", "keep default") resolve
+            # every intent flag from one dict hit instead of the full battery.
+            finalize_intent, defaults_acceptance_intent = short_intents
+            wants_more_optional_details = False
+            explanation_field = ""
+            field_label_reference = ""
+            pause_intent = False
+            off_topic_intent = False
+        else:
+            finalize_intent = _is_finalize_intent(user_message)
+            defaults_acceptance_intent = _is_defaults_acceptance_intent(user_message)
+            wants_more_optional_details = _wants_more_optional_details(user_message)
+            explanation_field = _field_explanation_request_field(user_message)
+            field_label_reference = _field_label_reference_field(user_message)
+            pause_intent = _is_pause_or_rest_intent(user_message)
+            off_topic_intent = _is_off_topic_or_out_of_scope(user_message)
         assistant_recently_finalized = _assistant_recently_finalized(conversation or [])
         
         # New logic: Don't hijack the reply or auto-finalize unless absolutely certain.
@@ -859,7 +935,7 @@ class LLMService:
         if explanation_field or field_label_reference:
             field_for_help = explanation_field or field_label_reference
             is_finalized = False
-            if field_for_help in _PROFILE_FIELD_ORDER:
+            if field_for_help in _PROFILE_FIELD_SET:
                 next_field = field_for_help
             reply = _field_explanation_reply(field_for_help)
             raw_suggestions = payload.get("suggestions", [])
@@ -911,7 +987,7 @@ class LLMService:
             is_finalized = False
             if not next_field:
                 next_field = _next_missing_required_field(merged) or missing_required[0]
-            elif next_field not in _REQUIRED_PROFILE_FIELDS:
+            elif next_field not in _REQUIRED_PROFILE_FIELD_SET:
                 # Keep required-field sequencing intact until the brief is complete.
                 next_field = _next_missing_required_field(merged) or missing_required[0]
             elif next_field in updates and next_field not in missing_required:
@@ -1016,7 +1092,7 @@ class LLMService:
             return {
                 "assistant_reply": _field_explanation_reply(help_field),
                 "field_updates": {},
-                "next_field": help_field if help_field in _PROFILE_FIELD_ORDER else "",
+                "next_field": help_field if help_field in _PROFILE_FIELD_SET else "",
                 "is_finalized": False,
                 "missing_required": missing_required,
                 "suggestions": _assistant_suggestion_fallback(help_field, merged),
@@ -1257,43 +1333,52 @@ def _project_profile_dict(project: BookProject) -> Dict[str, Any]:
     return profile if isinstance(profile, dict) else {}
 
 
+# Normalized label -> canonical element type, built once at import.
+_CANONICAL_RICH_TYPES = {
+    "tables": "table",
+    "table": "table",
+    "flowcharts": "flowchart",
+    "flowchart": "flowchart",
+    "figures diagrams": "figure",
+    "figure": "figure",
+    "figures": "figure",
+    "diagram": "figure",
+    "diagrams": "figure",
+    "callout boxes": "callout",
+    "callout box": "callout",
+    "callouts": "callout",
+    "callout": "callout",
+    "code blocks": "code_block",
+    "code block": "code_block",
+    "code": "code_block",
+    "quotes": "quote",
+    "quote": "quote",
+    "lists": "list",
+    "list": "list",
+}
+
+
 def _canonical_rich_element_type(value: Any) -> str:
-    text = _normalize_for_match(str(value or ""))
-    mapping = {
-        "tables": "table",
-        "table": "table",
-        "flowcharts": "flowchart",
-        "flowchart": "flowchart",
-        "figures diagrams": "figure",
-        "figure": "figure",
-        "figures": "figure",
-        "diagram": "figure",
-        "diagrams": "figure",
-        "callout boxes": "callout",
-        "callout box": "callout",
-        "callouts": "callout",
-        "callout": "callout",
-        "code blocks": "code_block",
-        "code block": "code_block",
-        "code": "code_block",
-        "quotes": "quote",
-        "quote": "quote",
-        "lists": "list",
-        "list": "list",
-    }
-    return mapping.get(text, "")
+    return _CANONICAL_RICH_TYPES.get(_normalize_for_match(str(value or "")), "")
 
 
-def _requested_rich_elements_from_project(project: BookProject) -> List[str]:
-    profile = _project_profile_dict(project)
-    raw = profile.get("richElements", [])
-    items = raw if isinstance(raw, list) else []
+@lru_cache(maxsize=256)
+def _canonical_rich_elements(raw_items: tuple) -> tuple:
     out: List[str] = []
-    for item in items:
+    for item in raw_items:
         canonical = _canonical_rich_element_type(item)
         if canonical and canonical not in out:
             out.append(canonical)
-    return out
+    return tuple(out)
+
+
+def _requested_rich_elements_from_project(project: BookProject) -> List[str]:
+    profile = _project_profile_dict(project)
+    raw = profile.get("richElements", [])
+    items = raw if isinstance(raw, list) else []
+    # Stringify to a hashable key; a project's richElements list repeats for
+    # every chapter of a run, so the canonical walk is done once per list.
+    return list(_canonical_rich_elements(tuple(str(item or "") for item in items)))
 
 
 def _normalize_chapter_plan_rich_elements(plan: Dict[str, Any] | Any) -> Dict[str, Any]:
@@ -1416,10 +1501,20 @@ def _rich_elements_preferences_block(project: BookProject, chapter_plan: Dict[st
     return _section("Rich Elements Preferences", "\n".join(lines))
 
 
+# Compiled once: these scan every generated chapter body, so per-call
+# compilation / re-module cache lookups add up during multi-chapter runs.
+_VISUAL_PLACEHOLDER_RE = re.compile(r"^\[(FIGURE|FLOWCHART)\s*:\s*(.+?)\]\s*$", flags=re.IGNORECASE | re.MULTILINE)
+_QUOTE_LINE_RE = re.compile(r"(?m)^\s*>\s+\S")
+_CALLOUT_LINE_RE = re.compile(r"(?m)^\s*>\s+\[\![A-Z]+\]")
+_TABLE_ROW_RE = re.compile(r"(?m)^\s*\|.+\|\s*$")
+_TABLE_SEP_RE = re.compile(r"(?m)^\s*\|?\s*:?-{2,}")
+_LIST_BULLET_RE = re.compile(r"(?m)^\s*[-*]\s+\S")
+_LIST_NUMBERED_RE = re.compile(r"(?m)^\s*\d+\.\s+\S")
+
+
 def _extract_visual_placeholders(content: str) -> List[Dict[str, str]]:
     placeholders: List[Dict[str, str]] = []
-    pattern = re.compile(r"^\[(FIGURE|FLOWCHART)\s*:\s*(.+?)\]\s*$", flags=re.IGNORECASE | re.MULTILINE)
-    for match in pattern.finditer(str(content or "")):
+    for match in _VISUAL_PLACEHOLDER_RE.finditer(str(content or "")):
         placeholders.append(
             {
                 "type": match.group(1).strip().lower(),
@@ -1441,13 +1536,13 @@ def _detect_rich_elements_in_content(content: str) -> List[str]:
 
     if "```" in text:
         add("code_block")
-    if re.search(r"(?m)^\s*>\s+\S", text):
+    if _QUOTE_LINE_RE.search(text):
         add("quote")
-    if re.search(r"(?m)^\s*>\s+\[\![A-Z]+\]", text):
+    if _CALLOUT_LINE_RE.search(text):
         add("callout")
-    if re.search(r"(?m)^\s*\|.+\|\s*$", text) and re.search(r"(?m)^\s*\|?\s*:?-{2,}", text):
+    if _TABLE_ROW_RE.search(text) and _TABLE_SEP_RE.search(text):
         add("table")
-    if re.search(r"(?m)^\s*[-*]\s+\S", text) or re.search(r"(?m)^\s*\d+\.\s+\S", text):
+    if _LIST_BULLET_RE.search(text) or _LIST_NUMBERED_RE.search(text):
         add("list")
     if "[figure:" in normalized:
         add("figure")
@@ -1461,10 +1556,13 @@ def _augment_chapter_payload_rich_elements(
     project: BookProject,
     chapter_plan: Dict[str, Any] | None,
 ) -> Dict[str, Any]:
-    out = dict(payload) if isinstance(payload, dict) else {}
-    chapter = out.get("chapter", {})
+    # Mutates payload in place; every caller rebinds or returns the result,
+    # so copying the payload dict per chapter bought nothing.
+    if not isinstance(payload, dict):
+        return {}
+    chapter = payload.get("chapter", {})
     if not isinstance(chapter, dict):
-        return out
+        return payload
 
     content = str(chapter.get("content", "") or "")
     requested = _requested_rich_elements_from_project(project)
@@ -1472,7 +1570,7 @@ def _augment_chapter_payload_rich_elements(
     placeholders = _extract_visual_placeholders(content)
     normalized_plan = _normalize_chapter_plan_rich_elements(chapter_plan or {})
 
-    metadata = out.get("metadata", {})
+    metadata = payload.get("metadata", {})
     if not isinstance(metadata, dict):
         metadata = {}
     rich_meta = metadata.get("rich_elements", {})
@@ -1493,8 +1591,8 @@ def _augment_chapter_payload_rich_elements(
         rich_meta.setdefault("render_status", "placeholders_pending")
 
     metadata["rich_elements"] = rich_meta
-    out["metadata"] = metadata
-    return out
+    payload["metadata"] = metadata
+    return payload
 
 
 def _refine_non_negotiables_block(project: BookProject) -> str:
@@ -1559,6 +1657,38 @@ def _split_profile_confirmed_and_defaults(profile: Dict[str, Any]) -> tuple[Dict
     return confirmed, defaults
 
 
+_VOCABULARY_SYNONYMS = {
+    "basic": "Simple",
+    "beginner": "Simple",
+    "easy": "Simple",
+    "simple": "Simple",
+    "medium": "Intermediate",
+    "moderate": "Intermediate",
+    "intermediate": "Intermediate",
+    "advanced": "Technical",
+    "expert": "Technical",
+    "technical": "Technical",
+    "literary": "Literary",
+}
+
+_TONE_SYNONYMS = {
+    "friendly": "Conversational",
+    "casual": "Conversational",
+    "warm": "Conversational",
+    "chatty": "Conversational",
+    "educational": "Informative",
+    "explanatory": "Informative",
+    "clear": "Informative",
+    "professional": "Formal",
+    "serious": "Formal",
+    "scholarly": "Academic",
+    "motivational": "Inspirational",
+    "encouraging": "Inspirational",
+    "fun": "Humorous",
+    "playful": "Humorous",
+}
+
+
 def _normalize_profile_value(field: str, value: Any) -> Any:
     if field in {"frontMatter", "backMatter", "richElements"}:
         if isinstance(value, list):
@@ -1566,52 +1696,29 @@ def _normalize_profile_value(field: str, value: Any) -> Any:
         if isinstance(value, str):
             return [part.strip() for part in value.split(",") if part.strip()]
         return []
+    if field == "ghostwritingMode" and isinstance(value, bool):
+        return value
+    return _normalize_profile_scalar(field, str(value))
+
+
+@lru_cache(maxsize=2048)
+def _normalize_profile_scalar(field: str, value: str) -> Any:
+    """Pure string normalization; the same field/value pairs recur every
+    assistant turn, so repeated lookups resolve from the cache."""
     if field == "ghostwritingMode":
-        if isinstance(value, bool):
-            return value
-        text = str(value).strip().lower()
-        return text in {"1", "true", "yes", "on"}
+        return value.strip().lower() in {"1", "true", "yes", "on"}
     if field == "length":
         try:
-            return max(300, int(float(str(value).strip())))
+            return max(300, int(float(value.strip())))
         except Exception:
             return 3000
     if field == "vocabularyLevel":
-        normalized = str(value).strip()
-        mapped = {
-            "basic": "Simple",
-            "beginner": "Simple",
-            "easy": "Simple",
-            "simple": "Simple",
-            "medium": "Intermediate",
-            "moderate": "Intermediate",
-            "intermediate": "Intermediate",
-            "advanced": "Technical",
-            "expert": "Technical",
-            "technical": "Technical",
-            "literary": "Literary",
-        }.get(normalized.lower())
-        return mapped or normalized
+        normalized = value.strip()
+        return _VOCABULARY_SYNONYMS.get(normalized.lower()) or normalized
     if field == "tone":
-        normalized = str(value).strip()
-        mapped = {
-            "friendly": "Conversational",
-            "casual": "Conversational",
-            "warm": "Conversational",
-            "chatty": "Conversational",
-            "educational": "Informative",
-            "explanatory": "Informative",
-            "clear": "Informative",
-            "professional": "Formal",
-            "serious": "Formal",
-            "scholarly": "Academic",
-            "motivational": "Inspirational",
-            "encouraging": "Inspirational",
-            "fun": "Humorous",
-            "playful": "Humorous",
-        }.get(normalized.lower())
-        return mapped or normalized
-    return str(value).strip()
+        normalized = value.strip()
+        return _TONE_SYNONYMS.get(normalized.lower()) or normalized
+    return value.strip()
 
 
 def _sanitize_assistant_updates(
@@ -1728,11 +1835,117 @@ def _extract_age_band(text: str) -> str:
     return f"{start}-{end}"
 
 
+# Compiled once at import: each of the intent checks below was an
+# any(phrase in text ...) scan over a phrase tuple, i.e. one full pass of
+# the message per phrase. A single escaped alternation keeps the exact
+# substring semantics while walking the normalized message once.
+def _phrase_re(*phrases: str) -> re.Pattern:
+    return re.compile("|".join(re.escape(phrase) for phrase in phrases))
+
+
+# Anchored variant for startswith-style prefix batteries.
+def _prefix_re(*prefixes: str) -> re.Pattern:
+    return re.compile("^(?:" + "|".join(re.escape(prefix) for prefix in prefixes) + ")")
+
+
+_FINALIZE_HOLD_RE = _phrase_re("don't", "do not", "not yet", "later", "wait", "hold")
+_HOLD_RE = _phrase_re("dont", "do not", "not yet", "later", "wait", "hold")
+_DEFAULTS_ACCEPT_RE = _phrase_re(
+    "keep default",
+    "keep defaults",
+    "use default",
+    "use defaults",
+    "you decide",
+    "set it yourself",
+    "set by yourself",
+    "add by yourself",
+    "add by your self",
+    "im happy with this",
+    "i am happy with this",
+    "looks good",
+    "sounds good",
+    "that is fine",
+    "thats fine",
+    "this is enough",
+    "good to go",
+)
+_MORE_OPTIONAL_RE = _phrase_re(
+    "add more detail",
+    "add more details",
+    "more optional detail",
+    "more optional details",
+    "add optional details",
+    "i want to add more details",
+    "include more elements",
+    "add more optional details",
+)
+_PAUSE_RE = _phrase_re(
+    "i am ill",
+    "im ill",
+    "i am sick",
+    "im sick",
+    "need to rest",
+    "i need to rest",
+    "need a break",
+    "i need a break",
+    "talk later",
+    "continue later",
+    "lets continue later",
+    "let s continue later",
+)
+_RECENTLY_FINALIZED_RE = _phrase_re(
+    "i have applied your brief to the form",
+    "your brief is all set",
+    "ive finalized the brief",
+    "i ve finalized the brief",
+    "all set ive finalized",
+    "all set i ve finalized",
+    "finalized the brief",
+)
+_OFF_TOPIC_RE = _phrase_re(
+    "write me a ",
+    "write a script",
+    "write a python code",
+    "write python code",
+    "python script",
+    "solve this",
+    "calculate ",
+    "translate this",
+    "tell me a joke",
+    "what is the weather",
+    "what s the weather",
+    "weather today",
+    "search the web",
+    "browse ",
+)
+# Exact normalized one-liners that dominate real sessions, mapped to
+# (finalize_intent, defaults_acceptance_intent). Every other intent flag is
+# False for these, so the normalizer can skip the full classifier battery.
+_SHORT_ACK_INTENTS = {
+    "ok": (False, False),
+    "okay": (False, False),
+    "yes": (False, False),
+    "finalize": (True, False),
+    "yes finalize": (True, False),
+    "keep default": (False, True),
+    "keep defaults": (False, True),
+}
+
+_COMPLETION_CLAIM_RE = _phrase_re(
+    "all required",
+    "ready to finalize",
+    "would you like to finalize",
+    "can finalize",
+    "finalize the book details",
+    "apply them to the form",
+)
+
+
 def _is_finalize_intent(message: str) -> bool:
     text = " ".join(str(message or "").strip().lower().split())
     if not text:
         return False
-    if any(token in text for token in ("don't", "do not", "not yet", "later", "wait", "hold")):
+    if _FINALIZE_HOLD_RE.search(text):
         return False
     if "finalize" in text or "finalise" in text:
         return True
@@ -1751,66 +1964,23 @@ def _is_defaults_acceptance_intent(message: str) -> bool:
     text = _normalize_for_match(message)
     if not text:
         return False
-    if any(token in text for token in ("dont", "do not", "not yet", "later", "wait", "hold")):
+    if _HOLD_RE.search(text):
         return False
-    phrases = (
-        "keep default",
-        "keep defaults",
-        "use default",
-        "use defaults",
-        "you decide",
-        "set it yourself",
-        "set by yourself",
-        "add by yourself",
-        "add by your self",
-        "im happy with this",
-        "i am happy with this",
-        "looks good",
-        "sounds good",
-        "that is fine",
-        "thats fine",
-        "this is enough",
-        "good to go",
-    )
-    return any(phrase in text for phrase in phrases)
+    return bool(_DEFAULTS_ACCEPT_RE.search(text))
 
 
 def _wants_more_optional_details(message: str) -> bool:
     text = _normalize_for_match(message)
     if not text:
         return False
-    phrases = (
-        "add more detail",
-        "add more details",
-        "more optional detail",
-        "more optional details",
-        "add optional details",
-        "i want to add more details",
-        "include more elements",
-        "add more optional details",
-    )
-    return any(phrase in text for phrase in phrases)
+    return bool(_MORE_OPTIONAL_RE.search(text))
 
 
 def _is_pause_or_rest_intent(message: str) -> bool:
     text = _normalize_for_match(message)
     if not text:
         return False
-    pause_phrases = (
-        "i am ill",
-        "im ill",
-        "i am sick",
-        "im sick",
-        "need to rest",
-        "i need to rest",
-        "need a break",
-        "i need a break",
-        "talk later",
-        "continue later",
-        "lets continue later",
-        "let s continue later",
-    )
-    return any(phrase in text for phrase in pause_phrases)
+    return bool(_PAUSE_RE.search(text))
 
 
 def _assistant_recently_finalized(conversation: List[Dict[str, str]]) -> bool:
@@ -1822,18 +1992,7 @@ def _assistant_recently_finalized(conversation: List[Dict[str, str]]) -> bool:
         text = _normalize_for_match(str(turn.get("content", "")))
         if not text:
             continue
-        if any(
-            phrase in text
-            for phrase in (
-                "i have applied your brief to the form",
-                "your brief is all set",
-                "ive finalized the brief",
-                "i ve finalized the brief",
-                "all set ive finalized",
-                "all set i ve finalized",
-                "finalized the brief",
-            )
-        ):
+        if _RECENTLY_FINALIZED_RE.search(text):
             return True
     return False
 
@@ -1846,26 +2005,7 @@ def _is_off_topic_or_out_of_scope(message: str) -> bool:
     # Topic-agnostic guard: only block requests that try to use the
     # profile assistant as a general-purpose chatbot/tool, not messages
     # about the book's subject matter.
-    truly_offtopic_signals = (
-        "write me a ",
-        "write a script",
-        "write a python code",
-        "write python code",
-        "python script",
-        "solve this",
-        "calculate ",
-        "translate this",
-        "tell me a joke",
-        "what is the weather",
-        "what s the weather",
-        "weather today",
-        "search the web",
-        "browse ",
-    )
-    if any(signal in text for signal in truly_offtopic_signals):
-        return True
-
-    return False
+    return bool(_OFF_TOPIC_RE.search(text))
 
 
 def _missing_required_profile(profile: Dict[str, Any]) -> List[str]:
@@ -1904,7 +2044,7 @@ def _missing_optional_profile_fields(profile: Dict[str, Any]) -> List[str]:
 
 def _next_missing_required_field(profile: Dict[str, Any]) -> Optional[str]:
     for field in _PROFILE_FIELD_ORDER:
-        if field not in _REQUIRED_PROFILE_FIELDS:
+        if field not in _REQUIRED_PROFILE_FIELD_SET:
             continue
         value = profile.get(field)
         if field == "title":
@@ -2013,6 +2153,7 @@ def _title_grounded_in_user_input(
     return bool(normalized_user_text and normalized_title in normalized_user_text)
 
 
+@lru_cache(maxsize=1024)
 def _normalize_for_match(value: str) -> str:
     cleaned = re.sub(r"[^a-z0-9]+", " ", str(value).lower())
     return " ".join(cleaned.split())
@@ -2034,13 +2175,9 @@ def _assistant_recently_mentions_value(value: str, conversation: List[Dict[str,
     return False
 
 
-def _is_affirmative_confirmation(message: str) -> bool:
-    text = _normalize_for_match(message)
-    if not text:
-        return False
-    if any(token in text for token in ("dont", "do not", "not", "later", "wait", "hold")):
-        return False
-    exact_yes = {
+_CONFIRM_HOLD_RE = _phrase_re("dont", "do not", "not", "later", "wait", "hold")
+_CONFIRM_EXACT_YES = frozenset(
+    {
         "yes",
         "y",
         "ok",
@@ -2056,24 +2193,37 @@ def _is_affirmative_confirmation(message: str) -> bool:
         "sounds good",
         "this is fine",
     }
-    if text in exact_yes:
+)
+_CONFIRM_YES_CONTEXT_RE = _phrase_re("title", "name", "good", "fine", "great")
+_CONFIRM_TITLE_PHRASE_RE = _phrase_re(
+    "i like that title",
+    "i like this title",
+    "i love that title",
+    "i love this title",
+    "that title works",
+    "this title works",
+    "use that title",
+    "keep that title",
+    "i like that name",
+    "that name works",
+)
+_CONFIRM_SENTIMENT_RE = _phrase_re("like", "love", "works", "perfect")
+_CONFIRM_SUBJECT_RE = _phrase_re("title", "name")
+
+
+def _is_affirmative_confirmation(message: str) -> bool:
+    text = _normalize_for_match(message)
+    if not text:
+        return False
+    if _CONFIRM_HOLD_RE.search(text):
+        return False
+    if text in _CONFIRM_EXACT_YES:
         return True
-    if "yes" in text and any(token in text for token in ("title", "name", "good", "fine", "great")):
+    if "yes" in text and _CONFIRM_YES_CONTEXT_RE.search(text):
         return True
-    if any(phrase in text for phrase in (
-        "i like that title",
-        "i like this title",
-        "i love that title",
-        "i love this title",
-        "that title works",
-        "this title works",
-        "use that title",
-        "keep that title",
-        "i like that name",
-        "that name works",
-    )):
+    if _CONFIRM_TITLE_PHRASE_RE.search(text):
         return True
-    if any(token in text for token in ("like", "love", "works", "perfect")) and any(token in text for token in ("title", "name")):
+    if _CONFIRM_SENTIMENT_RE.search(text) and _CONFIRM_SUBJECT_RE.search(text):
         return True
     return False
 
@@ -2082,15 +2232,7 @@ def _reply_claims_completion(reply: str) -> bool:
     text = _normalize_for_match(reply)
     if not text:
         return False
-    completion_signals = (
-        "all required",
-        "ready to finalize",
-        "would you like to finalize",
-        "can finalize",
-        "finalize the book details",
-        "apply them to the form",
-    )
-    return any(signal in text for signal in completion_signals)
+    return bool(_COMPLETION_CLAIM_RE.search(text))
 
 
 def _reply_stuck_in_optional_loop(reply: str) -> bool:
@@ -2177,7 +2319,7 @@ def _filter_assistant_suggestions_for_context(
         text = _normalize_for_match(suggestion)
         if not text:
             continue
-        if missing_required and any(token in text for token in ("finalize", "finalise", "confirm", "apply")):
+        if missing_required and _SUGG_FINALIZE_RE.search(text):
             continue
         if _looks_like_meta_workflow_suggestion(text):
             continue
@@ -2191,35 +2333,38 @@ def _filter_assistant_suggestions_for_context(
     return _assistant_suggestion_fallback(next_field, profile)
 
 
+_SUGG_FINALIZE_RE = _phrase_re("finalize", "finalise", "confirm", "apply")
+_META_WORKFLOW_RE = _prefix_re(
+    "lets ",
+    "let s ",
+    "move on",
+    "go to ",
+    "next step",
+    "discuss more",
+    "talk more",
+    "skip ",
+)
+_ASSUMPTIVE_GUESS_RE = _prefix_re(
+    "im focusing on",
+    "i am focusing on",
+    "my book is about",
+    "its about",
+    "it is about",
+    "i want to write about",
+    "i want this book to be about",
+    "i am writing about",
+)
+
+
 def _looks_like_meta_workflow_suggestion(normalized_text: str) -> bool:
-    prefixes = (
-        "lets ",
-        "let s ",
-        "move on",
-        "go to ",
-        "next step",
-        "discuss more",
-        "talk more",
-        "skip ",
-    )
-    return any(normalized_text.startswith(prefix) for prefix in prefixes)
+    return bool(_META_WORKFLOW_RE.match(normalized_text))
 
 
 def _looks_like_assumptive_content_guess(text: str) -> bool:
     normalized = _normalize_for_match(text)
     if not normalized:
         return False
-    assumptive_prefixes = (
-        "im focusing on",
-        "i am focusing on",
-        "my book is about",
-        "its about",
-        "it is about",
-        "i want to write about",
-        "i want this book to be about",
-        "i am writing about",
-    )
-    return any(normalized.startswith(prefix) for prefix in assumptive_prefixes)
+    return bool(_ASSUMPTIVE_GUESS_RE.match(normalized))
 
 
 def _assistant_topic_seed(profile: Dict[str, Any]) -> str:
@@ -2332,21 +2477,31 @@ def _assistant_suggestion_fallback(next_field: str, profile: Dict[str, Any]) ->
     return ["Tell me more", "Suggest options", "Use sensible defaults"]
 
 
+_FIELD_ALIASES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("frontMatter", ("front matter", "frontmatter")),
+    ("backMatter", ("back matter", "backmatter")),
+    ("primaryCta", ("primary cta", "primary cta after reading", "cta", "call to action")),
+    ("booksToEmulate", ("reference books", "books to emulate")),
+    ("styleReferencePassage", ("style reference passage", "style reference", "reference passage")),
+    ("customInstructions", ("topics skills", "topics / skills", "topics and skills", "custom instructions")),
+    ("contentBoundaries", ("content boundaries", "content boundaries optional", "boundaries")),
+    ("chapterLength", ("chapter length",)),
+    ("pageFeel", ("page feel",)),
+    ("publishingIntent", ("publishing intent",)),
+    ("audienceKnowledgeLevel", ("knowledge level", "audience knowledge level")),
+    ("richElements", ("rich elements", "elements", "visual elements")),
+)
+
+# Normalized alias -> field id, for the exact-match bare-label path.
+_LABEL_TO_FIELD = {
+    pattern: field
+    for field, patterns in _FIELD_ALIASES
+    for pattern in patterns
+}
+
+
 def _field_aliases() -> tuple[tuple[str, tuple[str, ...]], ...]:
-    return (
-        ("frontMatter", ("front matter", "frontmatter")),
-        ("backMatter", ("back matter", "backmatter")),
-        ("primaryCta", ("primary cta", "primary cta after reading", "cta", "call to action")),
-        ("booksToEmulate", ("reference books", "books to emulate")),
-        ("styleReferencePassage", ("style reference passage", "style reference", "reference passage")),
-        ("customInstructions", ("topics skills", "topics / skills", "topics and skills", "custom instructions")),
-        ("contentBoundaries", ("content boundaries", "content boundaries optional", "boundaries")),
-        ("chapterLength", ("chapter length",)),
-        ("pageFeel", ("page feel",)),
-        ("publishingIntent", ("publishing intent",)),
-        ("audienceKnowledgeLevel", ("knowledge level", "audience knowledge level")),
-        ("richElements", ("rich elements", "elements", "visual elements")),
-    )
+    return _FIELD_ALIASES
 
 
 def _field_label_reference_field(message: str) -> str:
@@ -2356,11 +2511,7 @@ def _field_label_reference_field(message: str) -> str:
     # Used when users tap/paste a field label directly (without asking a full question).
     if len(text.split()) > 6:
         return ""
-    for field, patterns in _field_aliases():
-        for pattern in patterns:
-            if text == pattern:
-                return field
-    return ""
+    return _LABEL_TO_FIELD.get(text, "")
 
 
 def _field_explanation_request_field(message: str) -> str:
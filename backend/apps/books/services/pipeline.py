@@ -1,21 +1,147 @@
 from __future__ import annotations
 
-import base64
+import binascii
 import io
 import re
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any, Dict, List
 
+from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 
 from ..models import BookProject, Chapter, ChapterStatus, ProjectStatus
 from .llm import LLMService
 from .vector_store import VectorMemoryStore
 
+_VISUAL_PLACEHOLDER_RE = re.compile(r"(?im)^\[(FIGURE|FLOWCHART)\s*:")
+_RENDER_VISUAL_RE = re.compile(r"^\[(FIGURE|FLOWCHART)\s*:\s*(.+?)\]\s*$", re.IGNORECASE)
+_RENDER_CALLOUT_RE = re.compile(r"^\[\!([A-Z]+)\]\s*(.*)$")
+_RENDER_TABLE_SEP_RE = re.compile(r"(?m)^\|?\s*:?-{2,}")
+_SAFE_FILE_TABLE = str.maketrans({c: "_" for c in '<>:"/\\|?*'})
+
+# Compiled once: _analyze_refine_feedback_conflicts scans the feedback with
+# each of these on every refine_toc call. POV and tone use one alternation
+# with named groups so the feedback is walked once per category instead of
+# once per candidate value.
+_POV_RE = re.compile(
+    r"\b(?:(?P<first>first[\s-]?person|memoir|i perspective)"
+    r"|(?P<second>second[\s-]?person|you perspective)"
+    r"|(?P<third>third[\s-]?person))\b"
+)
+_POV_LABELS = {
+    "first": "First Person",
+    "second": "Second Person",
+    "third": "Third Person",
+}
+_POV_ANCHORS = ("first", "second", "third", "memoir", "perspective")
+_ADVANCED_RE = re.compile(r"\b(expert|advanced|highly technical|assume prior knowledge|graduate level)\b")
+_TONE_RE = re.compile(
+    r"\b(?:(?P<formal>formal|academic)"
+    r"|(?P<conversational>conversational|casual|friendly)"
+    r"|(?P<humorous>humorous|funny|playful))\b"
+)
+_TONE_LABELS = {
+    "formal": "Formal/Academic",
+    "conversational": "Conversational",
+    "humorous": "Humorous/Playful",
+}
+_TONE_ANCHORS = ("formal", "academic", "conversational", "casual", "friendly", "humorous", "funny", "playful")
+_ADVANCED_ANCHORS = ("expert", "advanced", "technical", "graduate", "prior knowledge")
+_BOUNDARY_ANCHORS = ("ignore", "remove", "drop", "relax", "bypass", "override")
+_PURPOSE_ANCHORS = ("turn this", "change purpose", "story instead", "research report")
+_BOUNDARY_WEAKEN_RE = re.compile(r"\b(ignore|remove|drop|relax|bypass|override)\b.{0,40}\b(boundar|restriction|safety|limit)\b")
+_PURPOSE_CHANGE_RE = re.compile(r"\b(turn this into|change purpose to|make it a story instead|make it a research report)\b")
+
+# chapterLength label substring -> approximate words per chapter.
+_CHAPTER_LENGTH_WORDS = (("short", 1500), ("medium", 3000), ("long", 5000))
+
+
+def _b64(data: bytes) -> str:
+    """Base64-encode export bytes in a single C call (no MIME line wrapping)."""
+    return binascii.b2a_base64(data, newline=False).decode("ascii")
+
+
+def _as_dict(value: Any) -> Dict[str, Any]:
+    """Normalize possibly-malformed JSON metadata values to a dict once."""
+    return value if isinstance(value, dict) else {}
+
+
+# (assistant field, project field, max length) for the scalar columns a
+# finalized brief may update.
+_PROFILE_SCALAR_RULES = (
+    ("title", "title", 160),
+    ("genre", "genre", 80),
+    ("audience", "target_audience", 80),
+    ("language", "language", 40),
+    ("tone", "tone", 80),
+)
+
+
+def apply_profile_updates_if_finalized(project: BookProject, payload: Dict[str, Any]) -> bool:
+    """Persist a finalized assistant brief onto the project.
+
+    Shared by the workflow service and the profile-assistant view so both
+    paths go through the same locked read-modify-write. Returns True when
+    an update was written.
+    """
+    if not isinstance(payload, dict):
+        return False
+    if not bool(payload.get("is_finalized")):
+        return False
+
+    updates = payload.get("field_updates", {})
+    if not isinstance(updates, dict) or not updates:
+        return False
+
+    project_updates: Dict[str, Any] = {}
+    for source_field, target_field, max_length in _PROFILE_SCALAR_RULES:
+        value = updates.get(source_field)
+        if isinstance(value, str):
+            stripped = value.strip()
+            if stripped:
+                project_updates[target_field] = stripped[:max_length]
+    if "length" in updates:
+        try:
+            project_updates["target_word_count"] = max(300, int(float(str(updates["length"]).strip())))
+        except Exception:
+            pass
+
+    # Lock the row and re-read metadata inside one transaction so two
+    # concurrent finalizations cannot interleave their read-modify-write.
+    with transaction.atomic():
+        fresh_meta = (
+            BookProject.objects.select_for_update()
+            .values_list("metadata_json", flat=True)
+            .get(pk=project.pk)
+        )
+        raw_meta = fresh_meta if isinstance(fresh_meta, dict) else {}
+        user_concept = raw_meta.get("user_concept", {})
+        if not isinstance(user_concept, dict):
+            user_concept = {}
+        profile = user_concept.get("profile", {})
+        if not isinstance(profile, dict):
+            profile = {}
+        profile.update({str(k): v for k, v in updates.items()})
+        user_concept["profile"] = profile
+
+        new_meta = dict(raw_meta)
+        new_meta["user_concept"] = user_concept
+        new_meta["profile"] = profile
+        project_updates["metadata_json"] = new_meta
+
+        for field, value in project_updates.items():
+            setattr(project, field, value)
+        project.save(update_fields=list(project_updates.keys()) + ["updated_at"])
+    return True
+
 
 class BookWorkflowService:
     def __init__(self) -> None:
         self.llm = LLMService()
         self.vector_store = VectorMemoryStore(self.llm)
+        # Request-lifetime memo of _project_profile results, keyed by pk.
+        self._profile_cache: Dict[Any, Dict[str, Any]] = {}
 
     def execute_mode(self, project: BookProject, mode: str, inputs: Dict[str, Any]) -> Dict[str, Any]:
         if mode == "toc":
@@ -40,10 +166,11 @@ class BookWorkflowService:
         outline = self._normalize_outline(payload.get("outline", {}))
         fallback_info = self._runtime_fallback_info(payload)
         outline_profile_compliance = self._outline_profile_compliance(project, outline)
-        llm_runtime_meta = self._merge_dicts(
-            payload.get("metadata", {}),
-            {"profile_compliance": outline_profile_compliance},
-        )
+        payload_meta = payload.get("metadata")
+        llm_runtime_meta = {
+            **(payload_meta if isinstance(payload_meta, dict) else {}),
+            "profile_compliance": outline_profile_compliance,
+        }
 
         project.outline_json = outline
         project.metadata_json = self._merge_project_metadata(project, llm_runtime_meta)
@@ -94,13 +221,12 @@ class BookWorkflowService:
         outline = self._normalize_outline(payload.get("outline", {}))
         fallback_info = self._runtime_fallback_info(payload)
         outline_profile_compliance = self._outline_profile_compliance(project, outline)
-        llm_runtime_meta = self._merge_dicts(
-            payload.get("metadata", {}),
-            {
-                "profile_compliance": outline_profile_compliance,
-                "refine_feedback_analysis": refine_feedback_analysis,
-            },
-        )
+        payload_meta = payload.get("metadata")
+        llm_runtime_meta = {
+            **(payload_meta if isinstance(payload_meta, dict) else {}),
+            "profile_compliance": outline_profile_compliance,
+            "refine_feedback_analysis": refine_feedback_analysis,
+        }
 
         project.outline_json = outline
         project.metadata_json = self._merge_project_metadata(project, llm_runtime_meta)
@@ -115,9 +241,11 @@ class BookWorkflowService:
             warnings.extend([str(issue) for issue in refine_feedback_analysis.get("issues", []) if str(issue).strip()])
         if outline_profile_compliance.get("fail"):
             warnings.extend([str(issue) for issue in outline_profile_compliance.get("issues", []) if str(issue).strip()])
+        seen_warnings: set[str] = set()
         deduped_warnings: List[str] = []
         for warning in warnings:
-            if warning not in deduped_warnings:
+            if warning not in seen_warnings:
+                seen_warnings.add(warning)
                 deduped_warnings.append(warning)
 
         response = {
@@ -164,51 +292,8 @@ class BookWorkflowService:
         }
 
     def _apply_profile_updates_if_finalized(self, project: BookProject, payload: Dict[str, Any]) -> None:
-        if not isinstance(payload, dict):
-            return
-        if not bool(payload.get("is_finalized")):
-            return
-
-        updates = payload.get("field_updates", {})
-        if not isinstance(updates, dict) or not updates:
-            return
-
-        project_updates: Dict[str, Any] = {}
-        if isinstance(updates.get("title"), str) and updates["title"].strip():
-            project_updates["title"] = updates["title"].strip()[:160]
-        if isinstance(updates.get("genre"), str) and updates["genre"].strip():
-            project_updates["genre"] = updates["genre"].strip()[:80]
-        if isinstance(updates.get("audience"), str) and updates["audience"].strip():
-            project_updates["target_audience"] = updates["audience"].strip()[:80]
-        if isinstance(updates.get("language"), str) and updates["language"].strip():
-            project_updates["language"] = updates["language"].strip()[:40]
-        if isinstance(updates.get("tone"), str) and updates["tone"].strip():
-            project_updates["tone"] = updates["tone"].strip()[:80]
-        if "length" in updates:
-            try:
-                project_updates["target_word_count"] = max(300, int(float(str(updates["length"]).strip())))
-            except Exception:
-                pass
-
-        raw_meta = project.metadata_json if isinstance(project.metadata_json, dict) else {}
-        user_concept = raw_meta.get("user_concept", {})
-        if not isinstance(user_concept, dict):
-            user_concept = {}
-        profile = user_concept.get("profile", {})
-        if not isinstance(profile, dict):
-            profile = {}
-        profile.update({str(k): v for k, v in updates.items()})
-        user_concept["profile"] = profile
-
-        new_meta = dict(raw_meta)
-        new_meta["user_concept"] = user_concept
-        new_meta["profile"] = profile
-        project_updates["metadata_json"] = new_meta
-
-        if project_updates:
-            for field, value in project_updates.items():
-                setattr(project, field, value)
-            project.save(update_fields=list(project_updates.keys()) + ["updated_at"])
+        if apply_profile_updates_if_finalized(project, payload):
+            self._profile_cache.pop(project.pk, None)
 
     def _run_chapter(self, project: BookProject, inputs: Dict[str, Any]) -> Dict[str, Any]:
         chapter_ctx = self.prepare_chapter_context(project, inputs)
@@ -226,7 +311,10 @@ class BookWorkflowService:
             chapter_number=chapter_ctx["chapter_number"],
             target=chapter_ctx["target"],
             chapter_data=payload.get("chapter", {}),
-            metadata=self._merge_dicts(payload.get("metadata", {}), fallback_info),
+            metadata={
+                **(payload.get("metadata") if isinstance(payload.get("metadata"), dict) else {}),
+                **fallback_info,
+            },
             next_steps=payload.get(
                 "next_steps",
                 ["Review the chapter and proceed to the next one."],
@@ -234,24 +322,31 @@ class BookWorkflowService:
         )
 
     def prepare_chapter_context(self, project: BookProject, inputs: Dict[str, Any]) -> Dict[str, Any]:
-        outline = self._normalize_outline(project.outline_json or {})
+        outline = self._normalized_project_outline(project)
         if not outline.get("chapters"):
             raise ValueError("Project does not have an outline yet")
 
         chapter_number = self._to_int(inputs.get("chapter_number"), "chapter_number")
-        target = next((c for c in outline["chapters"] if c["number"] == chapter_number), None)
+        chapters_by_number = {c["number"]: c for c in outline["chapters"]}
+        target = chapters_by_number.get(chapter_number)
         if not target:
             raise ValueError("chapter_number is outside outline range")
 
+        memory_query = f"{project.title} chapter {chapter_number} continuity and style"
+        knowledge_query = f"{project.title} chapter {chapter_number} facts references examples"
+        # One batched embedding round trip for both retrieval queries.
+        memory_vector, knowledge_vector = self.vector_store.embed_many([memory_query, knowledge_query])
         memory_context = self.vector_store.search_memory(
             project_id=str(project.id),
-            query=f"{project.title} chapter {chapter_number} continuity and style",
+            query=memory_query,
             limit=5,
+            vector=memory_vector,
         )
         knowledge_context = self.vector_store.search_knowledge_base(
             project_id=str(project.id),
-            query=f"{project.title} chapter {chapter_number} facts references examples",
+            query=knowledge_query,
             limit=6,
+            vector=knowledge_vector,
         )
 
         return {
@@ -296,7 +391,13 @@ class BookWorkflowService:
         )
         if vector_indexed and not chapter.vector_indexed:
             chapter.vector_indexed = True
-            chapter.save(update_fields=["vector_indexed", "updated_at"])
+            # Targeted UPDATE: skips model save() signal overhead and writes
+            # only the two columns. updated_at is set explicitly because
+            # queryset.update() bypasses auto_now.
+            Chapter.objects.filter(pk=chapter.pk).update(
+                vector_indexed=True,
+                updated_at=timezone.now(),
+            )
 
         project.status = ProjectStatus.WRITING
         project.updated_at = timezone.now()
@@ -316,7 +417,7 @@ class BookWorkflowService:
         }
 
     def _run_export(self, project: BookProject, inputs: Dict[str, Any]) -> Dict[str, Any]:
-        outline = self._normalize_outline(project.outline_json or {})
+        outline = self._normalized_project_outline(project)
         if not outline.get("chapters"):
             raise ValueError("Project does not have an outline yet")
 
@@ -336,8 +437,16 @@ class BookWorkflowService:
             "fallback_stages": [],
         }
 
+        # Parse each chapter's content into render blocks once; both the PDF
+        # and DOCX renderers consume the same parsed blocks.
         chapter_payload = [
-            {"number": c.number, "title": c.title, "content": c.content, "summary": c.summary}
+            {
+                "number": c.number,
+                "title": c.title,
+                "content": c.content,
+                "summary": c.summary,
+                "blocks": _iter_render_blocks(c.content),
+            }
             for c in chapters
         ]
         if any(self._has_visual_placeholders(ch.get("content", "")) for ch in chapter_payload):
@@ -345,15 +454,30 @@ class BookWorkflowService:
                 "Figure/flowchart placeholders were preserved in export. Render visual assets in a post-processing step to replace placeholders."
             )
 
-        if export_format in {"pdf", "both"}:
-            pdf_bytes = self._render_pdf(project, outline, chapter_payload)
-            output["pdf_base64"] = base64.b64encode(pdf_bytes).decode("utf-8")
+        if export_format == "both" and getattr(settings, "EXPORT_PARALLEL_RENDER", False):
+            # Both renders are CPU-bound; run them in separate processes so
+            # they do not serialise on the GIL. Gated by a setting because
+            # process spawn is not free on every deployment target.
+            meta = _export_project_meta(project)
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                pdf_future = executor.submit(_render_pdf_bytes, meta, outline, chapter_payload)
+                docx_future = executor.submit(_render_docx_bytes, meta, outline, chapter_payload)
+                pdf_bytes = pdf_future.result()
+                docx_bytes = docx_future.result()
+            output["pdf_base64"] = _b64(pdf_bytes)
             output["pdf_filename"] = f"{self._safe_file(project.title)}.pdf"
-
-        if export_format in {"docx", "both"}:
-            docx_bytes = self._render_docx(project, outline, chapter_payload)
-            output["docx_base64"] = base64.b64encode(docx_bytes).decode("utf-8")
+            output["docx_base64"] = _b64(docx_bytes)
             output["docx_filename"] = f"{self._safe_file(project.title)}.docx"
+        else:
+            if export_format in {"pdf", "both"}:
+                pdf_bytes = self._render_pdf(project, outline, chapter_payload)
+                output["pdf_base64"] = _b64(pdf_bytes)
+                output["pdf_filename"] = f"{self._safe_file(project.title)}.pdf"
+
+            if export_format in {"docx", "both"}:
+                docx_bytes = self._render_docx(project, outline, chapter_payload)
+                output["docx_base64"] = _b64(docx_bytes)
+                output["docx_filename"] = f"{self._safe_file(project.title)}.docx"
 
         project.status = ProjectStatus.EXPORTED
         project.updated_at = timezone.now()
@@ -375,14 +499,6 @@ class BookWorkflowService:
         stages = [stage] if used_fallback and stage else []
         return {"used_fallback": used_fallback, "fallback_stages": stages}
 
-    def _merge_dicts(self, left: Dict[str, Any] | Any, right: Dict[str, Any] | Any) -> Dict[str, Any]:
-        out: Dict[str, Any] = {}
-        if isinstance(left, dict):
-            out.update(left)
-        if isinstance(right, dict):
-            out.update(right)
-        return out
-
     def _sync_chapters_from_outline(self, project: BookProject, outline: Dict[str, Any]) -> None:
         for chapter in outline.get("chapters", []):
             Chapter.objects.get_or_create(
@@ -396,6 +512,20 @@ class BookWorkflowService:
                 },
             )
 
+    def _normalized_project_outline(self, project: BookProject) -> Dict[str, Any]:
+        """Normalize project.outline_json, caching the result on the instance.
+
+        The cache is keyed on the identity of outline_json so any reassignment
+        (new outline, refresh_from_db) naturally invalidates it.
+        """
+        source = project.outline_json or {}
+        cached = getattr(project, "_normalized_outline_cache", None)
+        if cached is not None and cached[0] is source:
+            return cached[1]
+        outline = self._normalize_outline(source)
+        project._normalized_outline_cache = (source, outline)
+        return outline
+
     def _normalize_outline(self, outline: Dict[str, Any]) -> Dict[str, Any]:
         if not isinstance(outline, dict):
             raise ValueError("outline must be an object")
@@ -439,146 +569,10 @@ class BookWorkflowService:
             raise ValueError(f"{field} must be a valid integer") from exc
 
     def _render_pdf(self, project: BookProject, outline: Dict[str, Any], chapters: List[Dict[str, Any]]) -> bytes:
-        from reportlab.lib.pagesizes import A4
-        from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-        from reportlab.lib.units import inch
-        from reportlab.platypus import PageBreak, Paragraph, Preformatted, SimpleDocTemplate, Spacer
-
-        buf = io.BytesIO()
-        doc = SimpleDocTemplate(
-            buf,
-            pagesize=A4,
-            topMargin=1 * inch,
-            bottomMargin=1 * inch,
-            leftMargin=1 * inch,
-            rightMargin=1 * inch,
-        )
-        styles = getSampleStyleSheet()
-        h1 = ParagraphStyle("BookH1", parent=styles["Heading1"], spaceAfter=12)
-        h2 = ParagraphStyle("BookH2", parent=styles["Heading2"], spaceAfter=10)
-        body = ParagraphStyle("BookBody", parent=styles["BodyText"], leading=14, spaceAfter=8)
-        quote_style = ParagraphStyle("BookQuote", parent=body, leftIndent=18, rightIndent=8, italic=True)
-        callout_style = ParagraphStyle("BookCallout", parent=body, leftIndent=18, rightIndent=8, backColor="#f3f4f6")
-        placeholder_style = ParagraphStyle("BookPlaceholder", parent=body, italic=True, textColor="#555555")
-        code_style = ParagraphStyle(
-            "BookCode",
-            parent=styles["BodyText"],
-            fontName="Courier",
-            fontSize=9,
-            leading=11,
-            leftIndent=12,
-            rightIndent=6,
-            spaceAfter=8,
-        )
-
-        story: List[Any] = []
-        story.append(Spacer(1, 2 * inch))
-        story.append(Paragraph(self._escape(project.title), styles["Title"]))
-        story.append(Spacer(1, 0.2 * inch))
-        story.append(Paragraph(self._escape(f"{project.genre}  {project.language}  {project.tone}"), styles["Italic"]))
-        story.append(PageBreak())
-
-        story.append(Paragraph("Table of Contents", h1))
-        for ch in outline.get("chapters", []):
-            story.append(Paragraph(self._escape(f"Chapter {ch['number']}: {ch['title']}"), body))
-        story.append(PageBreak())
-
-        for ch in chapters:
-            story.append(Paragraph(self._escape(f"Chapter {ch['number']}"), h2))
-            story.append(Paragraph(self._escape(ch["title"]), h1))
-            story.append(Spacer(1, 0.1 * inch))
-            for block in self._iter_render_blocks(ch["content"]):
-                block_type = str(block.get("type", "paragraph"))
-                block_text = str(block.get("text", "")).strip()
-                if not block_text and block_type not in {"visual_placeholder"}:
-                    continue
-                if block_type == "h1":
-                    story.append(Paragraph(self._escape(block_text), h1))
-                elif block_type == "h2":
-                    story.append(Paragraph(self._escape(block_text), h2))
-                elif block_type == "code":
-                    story.append(Preformatted(block_text, code_style))
-                elif block_type == "quote":
-                    story.append(Paragraph(self._escape(block_text), quote_style))
-                elif block_type == "callout":
-                    label = str(block.get("label", "Note")).strip() or "Note"
-                    story.append(Paragraph(self._escape(f"{label}: {block_text}"), callout_style))
-                elif block_type == "visual_placeholder":
-                    kind = str(block.get("kind", "visual")).upper()
-                    label = str(block.get("label", "")).strip()
-                    story.append(Paragraph(self._escape(f"[{kind} PLACEHOLDER] {label}"), placeholder_style))
-                elif block_type == "table":
-                    story.append(Preformatted(block_text, code_style))
-                else:
-                    story.append(Paragraph(self._escape(block_text), body))
-            story.append(PageBreak())
-
-        doc.build(story)
-        buf.seek(0)
-        return buf.read()
+        return _render_pdf_bytes(_export_project_meta(project), outline, chapters)
 
     def _render_docx(self, project: BookProject, outline: Dict[str, Any], chapters: List[Dict[str, Any]]) -> bytes:
-        from docx import Document
-        from docx.enum.text import WD_ALIGN_PARAGRAPH
-        from docx.shared import Pt
-
-        document = Document()
-        title_paragraph = document.add_paragraph()
-        title_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run = title_paragraph.add_run(project.title)
-        run.bold = True
-        run.font.size = Pt(26)
-
-        sub = document.add_paragraph()
-        sub.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        sub_run = sub.add_run(f"{project.genre}  {project.language}  {project.tone}")
-        sub_run.italic = True
-        document.add_page_break()
-
-        document.add_heading("Table of Contents", level=1)
-        for ch in outline.get("chapters", []):
-            document.add_paragraph(f"Chapter {ch['number']}: {ch['title']}")
-        document.add_page_break()
-
-        for ch in chapters:
-            document.add_heading(f"Chapter {ch['number']}: {ch['title']}", level=1)
-            for block in self._iter_render_blocks(ch["content"]):
-                block_type = str(block.get("type", "paragraph"))
-                block_text = str(block.get("text", "")).strip()
-                if not block_text and block_type not in {"visual_placeholder"}:
-                    continue
-                if block_type == "h1":
-                    document.add_heading(block_text, level=1)
-                elif block_type == "h2":
-                    document.add_heading(block_text, level=2)
-                elif block_type == "code":
-                    p = document.add_paragraph()
-                    run = p.add_run(block_text)
-                    run.font.name = "Courier New"
-                    run.font.size = Pt(9)
-                elif block_type == "quote":
-                    p = document.add_paragraph()
-                    run = p.add_run(block_text)
-                    run.italic = True
-                elif block_type == "callout":
-                    p = document.add_paragraph()
-                    label = str(block.get("label", "Note")).strip() or "Note"
-                    run = p.add_run(f"{label}: {block_text}")
-                    run.italic = True
-                elif block_type == "visual_placeholder":
-                    kind = str(block.get("kind", "visual")).upper()
-                    label = str(block.get("label", "")).strip()
-                    p = document.add_paragraph()
-                    run = p.add_run(f"[{kind} PLACEHOLDER] {label}")
-                    run.italic = True
-                else:
-                    document.add_paragraph(block_text)
-            document.add_page_break()
-
-        out = io.BytesIO()
-        document.save(out)
-        out.seek(0)
-        return out.read()
+        return _render_docx_bytes(_export_project_meta(project), outline, chapters)
 
     def _split_blocks(self, text: str) -> List[str]:
         if not text:
@@ -588,120 +582,31 @@ class BookWorkflowService:
         return [b.strip() for b in blocks if b.strip()]
 
     def _has_visual_placeholders(self, text: str) -> bool:
-        return bool(re.search(r"(?im)^\[(FIGURE|FLOWCHART)\s*:", str(text or "")))
+        value = str(text or "")
+        # Cheap substring prefilter: chapter content rarely contains
+        # placeholders, so skip the regex scan entirely in the common case.
+        lowered = value.lower()
+        if "[figure" not in lowered and "[flowchart" not in lowered:
+            return False
+        return bool(_VISUAL_PLACEHOLDER_RE.search(value))
 
     def _iter_render_blocks(self, text: str) -> List[Dict[str, str]]:
-        norm = str(text or "").replace("\r\n", "\n").replace("\r", "\n")
-        if not norm.strip():
-            return []
-
-        lines = norm.split("\n")
-        blocks: List[Dict[str, str]] = []
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-            stripped = line.strip()
-            if not stripped:
-                i += 1
-                continue
-
-            if stripped.startswith("```"):
-                code_lines: List[str] = []
-                i += 1
-                while i < len(lines) and not lines[i].strip().startswith("```"):
-                    code_lines.append(lines[i])
-                    i += 1
-                if i < len(lines) and lines[i].strip().startswith("```"):
-                    i += 1
-                blocks.append({"type": "code", "text": "\n".join(code_lines).rstrip()})
-                continue
-
-            visual_match = re.match(r"^\[(FIGURE|FLOWCHART)\s*:\s*(.+?)\]\s*$", stripped, flags=re.IGNORECASE)
-            if visual_match:
-                blocks.append(
-                    {
-                        "type": "visual_placeholder",
-                        "kind": visual_match.group(1).strip().lower(),
-                        "label": visual_match.group(2).strip(),
-                        "text": "",
-                    }
-                )
-                i += 1
-                continue
-
-            if stripped.startswith(">"):
-                quote_lines: List[str] = []
-                callout_label = ""
-                while i < len(lines) and lines[i].strip().startswith(">"):
-                    raw_line = lines[i].strip()[1:].lstrip()
-                    callout_match = re.match(r"^\[\!([A-Z]+)\]\s*(.*)$", raw_line)
-                    if callout_match:
-                        callout_label = callout_match.group(1).title()
-                        raw_line = callout_match.group(2).strip()
-                    quote_lines.append(raw_line)
-                    i += 1
-                blocks.append(
-                    {
-                        "type": "callout" if callout_label else "quote",
-                        "label": callout_label,
-                        "text": "\n".join([line for line in quote_lines if line]).strip(),
-                    }
-                )
-                continue
-
-            if stripped.startswith("# "):
-                blocks.append({"type": "h1", "text": stripped[2:].strip()})
-                i += 1
-                continue
-            if stripped.startswith("## "):
-                blocks.append({"type": "h2", "text": stripped[3:].strip()})
-                i += 1
-                continue
-
-            if "|" in stripped:
-                table_lines: List[str] = []
-                start = i
-                while i < len(lines):
-                    probe = lines[i].strip()
-                    if not probe or "|" not in probe:
-                        break
-                    table_lines.append(probe)
-                    i += 1
-                table_text = "\n".join(table_lines).strip()
-                if len(table_lines) >= 2 and re.search(r"(?m)^\|?\s*:?-{2,}", table_text):
-                    blocks.append({"type": "table", "text": table_text})
-                    continue
-                i = start
-
-            paragraph_lines: List[str] = []
-            while i < len(lines):
-                probe = lines[i]
-                probe_stripped = probe.strip()
-                if not probe_stripped:
-                    break
-                if probe_stripped.startswith(("```", "# ", "## ", ">", "[")):
-                    break
-                paragraph_lines.append(probe_stripped)
-                i += 1
-            if paragraph_lines:
-                blocks.append({"type": "paragraph", "text": " ".join(paragraph_lines).strip()})
-            else:
-                i += 1
-
-        return blocks
+        return _iter_render_blocks(text)
 
     def _escape(self, value: str) -> str:
-        return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+        return _escape(value)
 
     def _safe_file(self, title: str) -> str:
-        sanitized = re.sub(r"[<>:\"/\\|?*]", "_", title).strip().strip(".")
+        sanitized = title.translate(_SAFE_FILE_TABLE).strip().strip(".")
         sanitized = sanitized.replace(" ", "_")
         return sanitized[:100] or "book"
 
     def _merge_project_metadata(self, project: BookProject, llm_metadata: Dict[str, Any] | Any) -> Dict[str, Any]:
-        existing = project.metadata_json if isinstance(project.metadata_json, dict) else {}
+        # The merge can change the stored profile; drop any memoized copy.
+        self._profile_cache.pop(project.pk, None)
+        existing = _as_dict(project.metadata_json)
         user_concept = self._build_user_concept_snapshot(project, existing)
-        llm_runtime = llm_metadata if isinstance(llm_metadata, dict) else {}
+        llm_runtime = _as_dict(llm_metadata)
         merged = dict(existing)
         merged["user_concept"] = user_concept
         merged["llm_runtime"] = llm_runtime
@@ -732,8 +637,7 @@ class BookWorkflowService:
             if not isinstance(bullet_points, list):
                 empty_bullet_chapters.append(int(chapter.get("number", 0)))
                 continue
-            non_empty_points = [bp for bp in bullet_points if str(bp).strip()]
-            if not non_empty_points:
+            if not any(str(bp).strip() for bp in bullet_points):
                 empty_bullet_chapters.append(int(chapter.get("number", 0)))
         if empty_bullet_chapters:
             issues.append(
@@ -742,13 +646,10 @@ class BookWorkflowService:
             checks["empty_bullet_chapters"] = empty_bullet_chapters
 
         chapter_length = str(profile.get("chapterLength", "")).strip().lower()
-        words_per_chapter = 0
-        if "short" in chapter_length:
-            words_per_chapter = 1500
-        elif "medium" in chapter_length:
-            words_per_chapter = 3000
-        elif "long" in chapter_length:
-            words_per_chapter = 5000
+        words_per_chapter = next(
+            (words for key, words in _CHAPTER_LENGTH_WORDS if key in chapter_length),
+            0,
+        )
 
         target_word_count = 0
         try:
@@ -786,16 +687,19 @@ class BookWorkflowService:
         issues: List[str] = []
         checks: Dict[str, Any] = {}
 
+        # Substring prefilters: str.__contains__ is far cheaper than the
+        # boundary alternations, so only run a regex when its anchor words
+        # actually appear in the feedback.
+        def has_any(words: tuple) -> bool:
+            return any(word in normalized for word in words)
+
         point_of_view = str(profile.get("pointOfView", "")).strip()
         pov_lower = point_of_view.lower()
-        if point_of_view:
+        if point_of_view and has_any(_POV_ANCHORS):
             requested_pov: str | None = None
-            if re.search(r"\b(first[\s-]?person|memoir|i perspective)\b", normalized):
-                requested_pov = "First Person"
-            elif re.search(r"\b(second[\s-]?person|you perspective)\b", normalized):
-                requested_pov = "Second Person"
-            elif re.search(r"\b(third[\s-]?person)\b", normalized):
-                requested_pov = "Third Person"
+            pov_match = _POV_RE.search(normalized)
+            if pov_match:
+                requested_pov = _POV_LABELS[pov_match.lastgroup]
             if requested_pov:
                 checks["pointOfView"] = {"profile": point_of_view, "feedback_request": requested_pov}
                 if (
@@ -810,8 +714,8 @@ class BookWorkflowService:
         audience_level = str(profile.get("audienceKnowledgeLevel", "")).strip()
         vocabulary_level = str(profile.get("vocabularyLevel", "")).strip()
         beginner_target = "beginner" in audience_level.lower() or vocabulary_level.lower() == "simple"
-        if beginner_target:
-            if re.search(r"\b(expert|advanced|highly technical|assume prior knowledge|graduate level)\b", normalized):
+        if beginner_target and has_any(_ADVANCED_ANCHORS):
+            if _ADVANCED_RE.search(normalized):
                 checks["readability"] = {
                     "profile_audience_level": audience_level,
                     "profile_vocabulary_level": vocabulary_level,
@@ -823,14 +727,11 @@ class BookWorkflowService:
 
         tone = str(profile.get("tone", "")).strip()
         tone_lower = tone.lower()
-        if tone:
+        if tone and has_any(_TONE_ANCHORS):
             requested_tone: str | None = None
-            if re.search(r"\b(formal|academic)\b", normalized):
-                requested_tone = "Formal/Academic"
-            elif re.search(r"\b(conversational|casual|friendly)\b", normalized):
-                requested_tone = "Conversational"
-            elif re.search(r"\b(humorous|funny|playful)\b", normalized):
-                requested_tone = "Humorous/Playful"
+            tone_match = _TONE_RE.search(normalized)
+            if tone_match:
+                requested_tone = _TONE_LABELS[tone_match.lastgroup]
             if requested_tone:
                 checks["tone"] = {"profile": tone, "feedback_signal": requested_tone}
                 if (
@@ -841,13 +742,13 @@ class BookWorkflowService:
                     issues.append(f"Refine feedback may conflict with saved tone ({tone}).")
 
         content_boundaries = str(profile.get("contentBoundaries", "")).strip()
-        if content_boundaries:
-            if re.search(r"\b(ignore|remove|drop|relax|bypass|override)\b.{0,40}\b(boundar|restriction|safety|limit)\b", normalized):
+        if content_boundaries and has_any(_BOUNDARY_ANCHORS):
+            if _BOUNDARY_WEAKEN_RE.search(normalized):
                 checks["contentBoundaries"] = {"profile": content_boundaries[:240], "feedback_signal": "weaken/remove boundaries"}
                 issues.append("Refine feedback appears to weaken saved content boundaries. Review before applying.")
 
         book_purpose = str(profile.get("bookPurpose", "")).strip()
-        if book_purpose and re.search(r"\b(turn this into|change purpose to|make it a story instead|make it a research report)\b", normalized):
+        if book_purpose and has_any(_PURPOSE_ANCHORS) and _PURPOSE_CHANGE_RE.search(normalized):
             checks["bookPurpose"] = {"profile": book_purpose}
             issues.append(f"Refine feedback may change the saved book purpose ({book_purpose}).")
 
@@ -858,18 +759,17 @@ class BookWorkflowService:
         }
 
     def _project_profile(self, project: BookProject) -> Dict[str, Any]:
-        metadata = project.metadata_json if isinstance(project.metadata_json, dict) else {}
-        user_concept = metadata.get("user_concept", {})
-        if isinstance(user_concept, dict):
-            profile = user_concept.get("profile", {})
-            if isinstance(profile, dict):
-                return profile
-        legacy_profile = metadata.get("profile", {})
-        return legacy_profile if isinstance(legacy_profile, dict) else {}
+        cached = self._profile_cache.get(project.pk)
+        if cached is not None:
+            return cached
+        metadata = _as_dict(project.metadata_json)
+        user_concept = _as_dict(metadata.get("user_concept"))
+        profile = _as_dict(user_concept.get("profile")) or _as_dict(metadata.get("profile"))
+        self._profile_cache[project.pk] = profile
+        return profile
 
     def _build_user_concept_snapshot(self, project: BookProject, existing_meta: Dict[str, Any]) -> Dict[str, Any]:
-        existing_user = existing_meta.get("user_concept", {})
-        user_concept = dict(existing_user) if isinstance(existing_user, dict) else {}
+        user_concept = dict(_as_dict(existing_meta.get("user_concept")))
         user_concept.setdefault("title", project.title)
         user_concept.setdefault("genre", project.genre)
         user_concept.setdefault("target_audience", project.target_audience)
@@ -878,10 +778,278 @@ class BookWorkflowService:
         user_concept.setdefault("target_word_count", project.target_word_count)
 
         if not isinstance(user_concept.get("profile"), dict):
-            legacy_profile = existing_meta.get("profile", {})
-            user_concept["profile"] = legacy_profile if isinstance(legacy_profile, dict) else {}
+            user_concept["profile"] = _as_dict(existing_meta.get("profile"))
         if "subtitle" not in user_concept and isinstance(existing_meta.get("subtitle"), str):
             user_concept["subtitle"] = existing_meta.get("subtitle", "")
         if "instruction_brief" not in user_concept and isinstance(existing_meta.get("instruction_brief"), str):
             user_concept["instruction_brief"] = existing_meta.get("instruction_brief", "")
         return user_concept
+
+def _export_project_meta(project: BookProject) -> Dict[str, str]:
+    """Plain-data snapshot of the project fields the renderers need.
+
+    Keeps the render functions free of ORM objects so they can be shipped
+    to a worker process when parallel export is enabled.
+    """
+    return {
+        "title": project.title,
+        "genre": project.genre,
+        "language": project.language,
+        "tone": project.tone,
+    }
+
+
+def _iter_render_blocks(text: str) -> List[Dict[str, str]]:
+    norm = str(text or "").replace("\r\n", "\n").replace("\r", "\n")
+    if not norm.strip():
+        return []
+
+    lines = norm.split("\n")
+    blocks: List[Dict[str, str]] = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        if not stripped:
+            i += 1
+            continue
+
+        if stripped.startswith("```"):
+            code_lines: List[str] = []
+            i += 1
+            while i < len(lines) and not lines[i].strip().startswith("```"):
+                code_lines.append(lines[i])
+                i += 1
+            if i < len(lines) and lines[i].strip().startswith("```"):
+                i += 1
+            blocks.append({"type": "code", "text": "\n".join(code_lines).rstrip()})
+            continue
+
+        visual_match = _RENDER_VISUAL_RE.match(stripped)
+        if visual_match:
+            blocks.append(
+                {
+                    "type": "visual_placeholder",
+                    "kind": visual_match.group(1).strip().lower(),
+                    "label": visual_match.group(2).strip(),
+                    "text": "",
+                }
+            )
+            i += 1
+            continue
+
+        if stripped.startswith(">"):
+            quote_lines: List[str] = []
+            callout_label = ""
+            while i < len(lines) and lines[i].strip().startswith(">"):
+                raw_line = lines[i].strip()[1:].lstrip()
+                callout_match = _RENDER_CALLOUT_RE.match(raw_line)
+                if callout_match:
+                    callout_label = callout_match.group(1).title()
+                    raw_line = callout_match.group(2).strip()
+                quote_lines.append(raw_line)
+                i += 1
+            blocks.append(
+                {
+                    "type": "callout" if callout_label else "quote",
+                    "label": callout_label,
+                    "text": "\n".join([line for line in quote_lines if line]).strip(),
+                }
+            )
+            continue
+
+        if stripped.startswith("# "):
+            blocks.append({"type": "h1", "text": stripped[2:].strip()})
+            i += 1
+            continue
+        if stripped.startswith("## "):
+            blocks.append({"type": "h2", "text": stripped[3:].strip()})
+            i += 1
+            continue
+
+        if "|" in stripped:
+            table_lines: List[str] = []
+            start = i
+            while i < len(lines):
+                probe = lines[i].strip()
+                if not probe or "|" not in probe:
+                    break
+                table_lines.append(probe)
+                i += 1
+            table_text = "\n".join(table_lines).strip()
+            if len(table_lines) >= 2 and _RENDER_TABLE_SEP_RE.search(table_text):
+                blocks.append({"type": "table", "text": table_text})
+                continue
+            i = start
+
+        paragraph_lines: List[str] = []
+        while i < len(lines):
+            probe = lines[i]
+            probe_stripped = probe.strip()
+            if not probe_stripped:
+                break
+            if probe_stripped.startswith(("```", "# ", "## ", ">", "[")):
+                break
+            paragraph_lines.append(probe_stripped)
+            i += 1
+        if paragraph_lines:
+            blocks.append({"type": "paragraph", "text": " ".join(paragraph_lines).strip()})
+        else:
+            i += 1
+
+    return blocks
+
+
+def _escape(value: str) -> str:
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _render_pdf_bytes(meta: Dict[str, str], outline: Dict[str, Any], chapters: List[Dict[str, Any]]) -> bytes:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.platypus import PageBreak, Paragraph, Preformatted, SimpleDocTemplate, Spacer
+
+    buf = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buf,
+        pagesize=A4,
+        topMargin=1 * inch,
+        bottomMargin=1 * inch,
+        leftMargin=1 * inch,
+        rightMargin=1 * inch,
+    )
+    styles = getSampleStyleSheet()
+    h1 = ParagraphStyle("BookH1", parent=styles["Heading1"], spaceAfter=12)
+    h2 = ParagraphStyle("BookH2", parent=styles["Heading2"], spaceAfter=10)
+    body = ParagraphStyle("BookBody", parent=styles["BodyText"], leading=14, spaceAfter=8)
+    quote_style = ParagraphStyle("BookQuote", parent=body, leftIndent=18, rightIndent=8, italic=True)
+    callout_style = ParagraphStyle("BookCallout", parent=body, leftIndent=18, rightIndent=8, backColor="#f3f4f6")
+    placeholder_style = ParagraphStyle("BookPlaceholder", parent=body, italic=True, textColor="#555555")
+    code_style = ParagraphStyle(
+        "BookCode",
+        parent=styles["BodyText"],
+        fontName="Courier",
+        fontSize=9,
+        leading=11,
+        leftIndent=12,
+        rightIndent=6,
+        spaceAfter=8,
+    )
+
+    story: List[Any] = []
+    story.append(Spacer(1, 2 * inch))
+    story.append(Paragraph(_escape(meta["title"]), styles["Title"]))
+    story.append(Spacer(1, 0.2 * inch))
+    story.append(Paragraph(_escape(f"{meta['genre']}  {meta['language']}  {meta['tone']}"), styles["Italic"]))
+    story.append(PageBreak())
+
+    story.append(Paragraph("Table of Contents", h1))
+    for ch in outline.get("chapters", []):
+        story.append(Paragraph(_escape(f"Chapter {ch['number']}: {ch['title']}"), body))
+    story.append(PageBreak())
+
+    for ch in chapters:
+        story.append(Paragraph(_escape(f"Chapter {ch['number']}"), h2))
+        story.append(Paragraph(_escape(ch["title"]), h1))
+        story.append(Spacer(1, 0.1 * inch))
+        blocks = ch.get("blocks")
+        if blocks is None:
+            blocks = _iter_render_blocks(ch["content"])
+        for block in blocks:
+            block_type = str(block.get("type", "paragraph"))
+            block_text = str(block.get("text", "")).strip()
+            if not block_text and block_type not in {"visual_placeholder"}:
+                continue
+            if block_type == "h1":
+                story.append(Paragraph(_escape(block_text), h1))
+            elif block_type == "h2":
+                story.append(Paragraph(_escape(block_text), h2))
+            elif block_type == "code":
+                story.append(Preformatted(block_text, code_style))
+            elif block_type == "quote":
+                story.append(Paragraph(_escape(block_text), quote_style))
+            elif block_type == "callout":
+                label = str(block.get("label", "Note")).strip() or "Note"
+                story.append(Paragraph(_escape(f"{label}: {block_text}"), callout_style))
+            elif block_type == "visual_placeholder":
+                kind = str(block.get("kind", "visual")).upper()
+                label = str(block.get("label", "")).strip()
+                story.append(Paragraph(_escape(f"[{kind} PLACEHOLDER] {label}"), placeholder_style))
+            elif block_type == "table":
+                story.append(Preformatted(block_text, code_style))
+            else:
+                story.append(Paragraph(_escape(block_text), body))
+        story.append(PageBreak())
+
+    doc.build(story)
+    buf.seek(0)
+    return buf.read()
+
+
+def _render_docx_bytes(meta: Dict[str, str], outline: Dict[str, Any], chapters: List[Dict[str, Any]]) -> bytes:
+    from docx import Document
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Pt
+
+    document = Document()
+    title_paragraph = document.add_paragraph()
+    title_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    run = title_paragraph.add_run(meta["title"])
+    run.bold = True
+    run.font.size = Pt(26)
+
+    sub = document.add_paragraph()
+    sub.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    sub_run = sub.add_run(f"{meta['genre']}  {meta['language']}  {meta['tone']}")
+    sub_run.italic = True
+    document.add_page_break()
+
+    document.add_heading("Table of Contents", level=1)
+    for ch in outline.get("chapters", []):
+        document.add_paragraph(f"Chapter {ch['number']}: {ch['title']}")
+    document.add_page_break()
+
+    for ch in chapters:
+        document.add_heading(f"Chapter {ch['number']}: {ch['title']}", level=1)
+        blocks = ch.get("blocks")
+        if blocks is None:
+            blocks = _iter_render_blocks(ch["content"])
+        for block in blocks:
+            block_type = str(block.get("type", "paragraph"))
+            block_text = str(block.get("text", "")).strip()
+            if not block_text and block_type not in {"visual_placeholder"}:
+                continue
+            if block_type == "h1":
+                document.add_heading(block_text, level=1)
+            elif block_type == "h2":
+                document.add_heading(block_text, level=2)
+            elif block_type == "code":
+                p = document.add_paragraph()
+                run = p.add_run(block_text)
+                run.font.name = "Courier New"
+                run.font.size = Pt(9)
+            elif block_type == "quote":
+                p = document.add_paragraph()
+                run = p.add_run(block_text)
+                run.italic = True
+            elif block_type == "callout":
+                p = document.add_paragraph()
+                label = str(block.get("label", "Note")).strip() or "Note"
+                run = p.add_run(f"{label}: {block_text}")
+                run.italic = True
+            elif block_type == "visual_placeholder":
+                kind = str(block.get("kind", "visual")).upper()
+                label = str(block.get("label", "")).strip()
+                p = document.add_paragraph()
+                run = p.add_run(f"[{kind} PLACEHOLDER] {label}")
+                run.italic = True
+            else:
+                document.add_paragraph(block_text)
+        document.add_page_break()
+
+    out = io.BytesIO()
+    document.save(out)
+    out.seek(0)
+    return out.read()
+
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import heapq
 import logging
+import re
 import uuid
-from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 
 from django.conf import settings
 
 from .llm import LLMService
 
 logger = logging.getLogger(__name__)
+_WS_RE = re.compile(r"\s+")
 PRIORITY_WEIGHT_MAP = {
     "primary": 5,
     "supporting": 3,
@@ -22,6 +26,12 @@ except Exception:  # pragma: no cover
     QdrantClient = None
     qmodels = None
 
+# Process-wide client and "collection exists" cache. Celery tasks build a
+# fresh BookWorkflowService per invocation; without these, every task paid a
+# client construction plus a get_collections() round trip.
+_client_singleton: Any = None
+_verified_collections: set = set()
+
 
 class VectorMemoryStore:
     """
@@ -34,12 +44,20 @@ class VectorMemoryStore:
         self._llm = llm_service
         self._client = None
         if QdrantClient is not None:
+            global _client_singleton
             try:
-                self._client = QdrantClient(
-                    url=settings.QDRANT_URL,
-                    api_key=settings.QDRANT_API_KEY or None,
-                    timeout=10.0,
-                )
+                if _client_singleton is None:
+                    # gRPC keeps one multiplexed connection per process
+                    # instead of paying HTTP setup per call; disable via
+                    # settings for deployments that only expose REST.
+                    _client_singleton = QdrantClient(
+                        url=settings.QDRANT_URL,
+                        api_key=settings.QDRANT_API_KEY or None,
+                        timeout=10.0,
+                        prefer_grpc=getattr(settings, "QDRANT_PREFER_GRPC", False),
+                        grpc_port=int(getattr(settings, "QDRANT_GRPC_PORT", 6334)),
+                    )
+                self._client = _client_singleton
                 self._ensure_collection()
             except Exception:
                 logger.warning("Failed to initialize Qdrant client", exc_info=True)
@@ -48,17 +66,40 @@ class VectorMemoryStore:
     def _ensure_collection(self) -> None:
         if not self._client or qmodels is None:
             return
+        if self.collection in _verified_collections:
+            return
         collections = self._client.get_collections().collections
         existing = {c.name for c in collections}
-        if self.collection in existing:
-            return
-        self._client.create_collection(
-            collection_name=self.collection,
-            vectors_config=qmodels.VectorParams(
-                size=3072,
-                distance=qmodels.Distance.COSINE,
-            ),
-        )
+        if self.collection not in existing:
+            self._client.create_collection(
+                collection_name=self.collection,
+                vectors_config=qmodels.VectorParams(
+                    size=3072,
+                    distance=qmodels.Distance.COSINE,
+                ),
+            )
+        _verified_collections.add(self.collection)
+
+    def embed_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Embed several texts in one provider round trip.
+
+        Returns one vector (or None) per text, in order. No-ops to all-None
+        when the vector store is unavailable so callers can skip the search.
+        """
+        if not texts:
+            return []
+        if not self._client or qmodels is None:
+            return [None] * len(texts)
+        batch_embed = getattr(self._llm, "embed_many", None)
+        if callable(batch_embed):
+            return batch_embed(texts)
+        if len(texts) == 1:
+            return [self._llm.embed(texts[0])]
+        # No batch API on this LLM adapter: the per-text calls are I/O-bound
+        # HTTP round trips, so overlap them with a bounded thread pool.
+        max_workers = min(len(texts), int(getattr(settings, "EMBEDDING_CONCURRENCY", 8)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self._llm.embed, texts))
 
     def upsert_chapter_memory(
         self,
@@ -67,22 +108,30 @@ class VectorMemoryStore:
         title: str,
         content: str,
         summary: str,
+        vector: Optional[List[float]] = None,
     ) -> bool:
         if not self._client or qmodels is None:
             return False
 
-        vector = self._llm.embed(f"{title}\n{summary}\n{content[:8000]}")
+        # Slice the truncations once and drop the full content reference so
+        # a large chapter body is not kept alive through the embed and
+        # upsert calls below.
+        embed_text = f"{title}\n{summary}\n{content[:8000]}"
+        payload_content = content[:12000]
+        del content
+
+        vector = vector or self._llm.embed(embed_text)
         if not vector:
             return False
 
-        point_id = str(uuid.uuid4())
+        point_id = uuid.uuid4().hex
         payload = {
             "project_id": project_id,
             "memory_type": "chapter",
             "chapter_number": chapter_number,
             "title": title,
             "summary": summary,
-            "content": content[:12000],
+            "content": payload_content,
         }
         self._client.upsert(
             collection_name=self.collection,
@@ -96,6 +145,53 @@ class VectorMemoryStore:
         )
         return True
 
+    def upsert_chapter_memories(self, project_id: str, chapters: List[Dict[str, Any]]) -> List[bool]:
+        """Batch variant of upsert_chapter_memory: one embed batch, one upsert.
+
+        Each chapter dict needs number/title/content/summary keys. Returns one
+        indexed-flag per chapter, in order.
+        """
+        if not chapters:
+            return []
+        if not self._client or qmodels is None:
+            return [False] * len(chapters)
+
+        texts = [
+            f"{chapter.get('title', '')}\n{chapter.get('summary', '')}\n{str(chapter.get('content', ''))[:8000]}"
+            for chapter in chapters
+        ]
+        vectors = self.embed_many(texts)
+
+        points = []
+        flags: List[bool] = []
+        for chapter, vector in zip(chapters, vectors):
+            if not vector:
+                flags.append(False)
+                continue
+            payload = {
+                "project_id": project_id,
+                "memory_type": "chapter",
+                "chapter_number": int(chapter.get("number", 0)),
+                "title": str(chapter.get("title", "")),
+                "summary": str(chapter.get("summary", "")),
+                "content": str(chapter.get("content", ""))[:12000],
+            }
+            points.append(
+                qmodels.PointStruct(
+                    id=uuid.uuid4().hex,
+                    vector=vector,
+                    payload=payload,
+                )
+            )
+            flags.append(True)
+
+        if points:
+            self._client.upsert(
+                collection_name=self.collection,
+                points=points,
+            )
+        return flags
+
     def upsert_source_memory(
         self,
         project_id: str,
@@ -114,9 +210,12 @@ class VectorMemoryStore:
         priority_label = str(source_priority_label or "supporting").strip().lower()
         priority_weight = self._priority_to_weight(priority_label)
 
+        # One batched embeddings request for all chunks instead of one
+        # provider round trip per chunk.
+        vectors = self.embed_many(chunks)
+
         points = []
-        for idx, chunk in enumerate(chunks):
-            vector = self._llm.embed(chunk)
+        for idx, (chunk, vector) in enumerate(zip(chunks, vectors)):
             if not vector:
                 continue
             payload = {
@@ -132,7 +231,7 @@ class VectorMemoryStore:
             }
             points.append(
                 qmodels.PointStruct(
-                    id=str(uuid.uuid4()),
+                    id=uuid.uuid4().hex,
                     vector=vector,
                     payload=payload,
                 )
@@ -146,11 +245,17 @@ class VectorMemoryStore:
 
         return {"chunks_total": len(chunks), "chunks_indexed": len(points)}
 
-    def search_memory(self, project_id: str, query: str, limit: int = 5) -> List[str]:
+    def search_memory(
+        self,
+        project_id: str,
+        query: str,
+        limit: int = 5,
+        vector: Optional[List[float]] = None,
+    ) -> List[str]:
         if not self._client or qmodels is None:
             return []
 
-        vector = self._llm.embed(query)
+        vector = vector or self._llm.embed(query)
         if not vector:
             return []
 
@@ -174,14 +279,23 @@ class VectorMemoryStore:
             memories.append(line.strip())
         return memories
 
-    def search_knowledge_base(self, project_id: str, query: str, limit: int = 6) -> List[str]:
+    def search_knowledge_base(
+        self,
+        project_id: str,
+        query: str,
+        limit: int = 6,
+        vector: Optional[List[float]] = None,
+    ) -> List[str]:
         if not self._client or qmodels is None:
             return []
 
-        vector = self._llm.embed(query)
+        vector = vector or self._llm.embed(query)
         if not vector:
             return []
 
+        # Overfetch so the priority rerank below selects from a pool wider
+        # than the final cut: a high-priority chunk just outside the raw
+        # semantic top-K would otherwise never be seen by the rerank.
         search_result = self._client.search(
             collection_name=self.collection,
             query_vector=vector,
@@ -191,7 +305,7 @@ class VectorMemoryStore:
                     qmodels.FieldCondition(key="memory_type", match=qmodels.MatchValue(value="kb")),
                 ]
             ),
-            limit=limit,
+            limit=limit * 4,
             with_payload=True,
         )
 
@@ -201,39 +315,43 @@ class VectorMemoryStore:
             title = str(payload.get("title", "")).strip()
             source_type = str(payload.get("source_type", "")).strip()
             priority_label = str(payload.get("source_priority_label", "supporting")).strip().lower() or "supporting"
-            priority_weight_raw = payload.get("source_priority_weight", self._priority_to_weight(priority_label))
+            # The label is already normalized; look the weight up directly
+            # instead of re-running strip/lower in _priority_to_weight.
+            default_weight = PRIORITY_WEIGHT_MAP.get(priority_label, PRIORITY_WEIGHT_MAP["supporting"])
+            priority_weight_raw = payload.get("source_priority_weight", default_weight)
             try:
                 priority_weight = max(1, min(5, int(float(str(priority_weight_raw)))))
             except Exception:
-                priority_weight = self._priority_to_weight(priority_label)
+                priority_weight = default_weight
             text = str(payload.get("content", "")).strip()
             semantic_score = float(getattr(point, "score", 0.0) or 0.0)
             final_score = semantic_score * (1.0 + 0.2 * priority_weight)
             line = f"[{source_type}|{priority_label}] {title}\n{text[:700]}".strip()
             ranked_items.append({"final_score": final_score, "line": line})
-        ranked_items.sort(key=lambda item: item["final_score"], reverse=True)
-        return [item["line"] for item in ranked_items[:limit]]
+        # O(N log K) top-K selection; equivalent to sorting then slicing.
+        top_items = heapq.nlargest(limit, ranked_items, key=lambda item: item["final_score"])
+        return [item["line"] for item in top_items]
 
     def _chunk_text(self, text: str, chunk_size: int = 1200, overlap: int = 200) -> List[str]:
         if not text:
             return []
-        norm = " ".join(text.replace("\r", " ").replace("\n", " ").split()).strip()
+        # Single regex pass instead of split()/join(), which materializes a
+        # full token list just to collapse whitespace.
+        norm = _WS_RE.sub(" ", text).strip()
         if not norm:
             return []
         if len(norm) <= chunk_size:
             return [norm]
 
         chunks: List[str] = []
-        start = 0
         text_len = len(norm)
-        while start < text_len:
-            end = min(text_len, start + chunk_size)
-            chunk = norm[start:end].strip()
+        step = max(1, chunk_size - overlap)
+        for start in range(0, text_len, step):
+            chunk = norm[start : start + chunk_size].strip()
             if chunk:
                 chunks.append(chunk)
-            if end >= text_len:
+            if start + chunk_size >= text_len:
                 break
-            start = max(end - overlap, start + 1)
         return chunks
 
     def _priority_to_weight(self, label: str) -> int:
@@ -1,15 +1,31 @@
 from __future__ import annotations
 
 from celery import shared_task
+from django.utils import timezone
 
-from .models import Chapter
+from .models import Chapter, SourceDocument
+from .services.knowledge_base import index_source_document
 from .services.pipeline import BookWorkflowService
 
 
+@shared_task
+def index_source_document_task(source_id: str) -> dict:
+    source = SourceDocument.objects.filter(id=source_id).first()
+    if not source:
+        return {"chunks_total": 0, "chunks_indexed": 0}
+    return index_source_document(source)
+
+
 @shared_task
 def reindex_chapter_memory(chapter_id: str) -> bool:
     service = BookWorkflowService()
-    chapter = Chapter.objects.select_related("project").filter(id=chapter_id).first()
+    # Only project_id (an FK column on Chapter itself) is needed, so skip
+    # the project join and prune the chapter columns to what the task uses.
+    chapter = (
+        Chapter.objects.filter(id=chapter_id)
+        .only("id", "project_id", "number", "title", "content", "summary", "vector_indexed", "updated_at")
+        .first()
+    )
     if not chapter:
         return False
     indexed = service.vector_store.upsert_chapter_memory(
@@ -23,3 +39,37 @@ def reindex_chapter_memory(chapter_id: str) -> bool:
         chapter.vector_indexed = True
         chapter.save(update_fields=["vector_indexed", "updated_at"])
     return indexed
+
+
+@shared_task
+def reindex_project_chapters(project_id: str) -> int:
+    """Reindex every unindexed chapter of a project in one batch.
+
+    Bulk-edit flows (e.g. finalize-all-chapters) should schedule this once
+    per project — optionally with a countdown to debounce bursts — instead
+    of firing reindex_chapter_memory per chapter: one embeddings batch and
+    one Qdrant upsert replace N round trips of each.
+    """
+    service = BookWorkflowService()
+    chapters = list(
+        Chapter.objects.filter(project_id=project_id, vector_indexed=False)
+        .only("id", "project_id", "number", "title", "content", "summary")
+        .order_by("number")
+    )
+    if not chapters:
+        return 0
+
+    indexed_flags = service.vector_store.upsert_chapter_memories(
+        project_id=str(project_id),
+        chapters=[
+            {"number": c.number, "title": c.title, "content": c.content, "summary": c.summary}
+            for c in chapters
+        ],
+    )
+    indexed_ids = [chapter.id for chapter, indexed in zip(chapters, indexed_flags) if indexed]
+    if indexed_ids:
+        Chapter.objects.filter(id__in=indexed_ids).update(
+            vector_indexed=True,
+            updated_at=timezone.now(),
+        )
+    return len(indexed_ids)
@@ -1,33 +1,69 @@
 from __future__ import annotations
 
-from copy import deepcopy
+import json
+import re
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase, override_settings
 
 from apps.books.models import BookProject
 from apps.books.services.llm import _profile_block
 from apps.books.services.pipeline import BookWorkflowService
 
 
-def _outline_payload() -> dict:
-    return {
-        "outline": {
-            "synopsis": "A practical guide.",
-            "chapters": [
-                {"number": 1, "title": "Start", "bullet_points": ["Context", "Goal"]},
-                {"number": 2, "title": "Build", "bullet_points": ["Steps", "Examples"]},
-            ],
-        }
+# _profile_block embeds the profile JSON inside a titled section.
+_PROFILE_JSON_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# Shared read-only template: the pipeline never mutates the outline it
+# receives (normalization builds fresh dicts) and the ORM serializes a
+# copy on save, so tests can hand out the same nested structure.
+_OUTLINE_TEMPLATE = {
+    "outline": {
+        "synopsis": "A practical guide.",
+        "chapters": [
+            {"number": 1, "title": "Start", "bullet_points": ["Context", "Goal"]},
+            {"number": 2, "title": "Build", "bullet_points": ["Steps", "Examples"]},
+        ],
     }
+}
+
+
+def _outline_payload() -> dict:
+    return {"outline": _OUTLINE_TEMPLATE["outline"]}
 
 
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
 class MetadataPreservationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # One patch pair for the whole class instead of a decorator pair
+        # per test; each test configures the shared mocks it needs.
+        cls._store_patch = patch("apps.books.services.pipeline.VectorMemoryStore")
+        cls._llm_patch = patch("apps.books.services.pipeline.LLMService")
+        cls.mock_store_cls = cls._store_patch.start()
+        cls.mock_llm_cls = cls._llm_patch.start()
+        cls.addClassCleanup(cls._store_patch.stop)
+        cls.addClassCleanup(cls._llm_patch.stop)
+        # Configured once for every test; an empty tuple so each call
+        # returns the same immutable singleton.
+        cls.mock_store_cls.return_value.search_knowledge_base.return_value = ()
+        # Built after the patches start so it wires up the mocked services.
+        cls.service = BookWorkflowService()
+
     def setUp(self):
-        self.user = get_user_model().objects.create_user(username="meta_user", password="pass12345")
-        self.project = BookProject.objects.create(
-            owner=self.user,
+        self.mock_llm_cls.reset_mock()
+        self.mock_store_cls.reset_mock()
+        # The service memoizes profiles by project pk; the pk is shared
+        # across tests here, so drop the memo between tests.
+        self.service._profile_cache.clear()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="meta_user", password="pass12345")
+        cls.project = BookProject.objects.create(
+            owner=cls.user,
             title="Original Title",
             genre="Education",
             target_audience="Beginners",
@@ -51,47 +87,21 @@ class MetadataPreservationTests(TestCase):
             },
         )
 
-    @patch("apps.books.services.pipeline.VectorMemoryStore")
-    @patch("apps.books.services.pipeline.LLMService")
-    def test_toc_preserves_user_concept_and_updates_llm_runtime(self, mock_llm_cls, mock_store_cls):
-        mock_store_cls.return_value.search_knowledge_base.return_value = []
-        llm = mock_llm_cls.return_value
-        payload = _outline_payload()
-        payload["metadata"] = {
+
+    def _reload(self, *fields: str) -> BookProject:
+        """Re-fetch the project with only the columns a test asserts on."""
+        return BookProject.objects.only(*fields).get(pk=self.project.pk)
+
+    def test_toc_and_refine_toc_preserve_user_concept_and_update_llm_runtime(self):
+        llm = self.mock_llm_cls.return_value
+        toc_payload = _outline_payload()
+        toc_payload["metadata"] = {
             "estimated_word_count": 4500,
             "chapter_count": 2,
             "profile": {"writingStyle": "Drifted"},
         }
-        llm.generate_outline.return_value = payload
-
-        service = BookWorkflowService()
-        before_user_concept = deepcopy(self.project.metadata_json["user_concept"])
-        output = service.execute_mode(self.project, "toc", {})
-
-        self.project.refresh_from_db()
-        metadata = self.project.metadata_json
-        self.assertEqual(metadata.get("user_concept"), before_user_concept)
-        llm_runtime = metadata.get("llm_runtime", {})
-        self.assertEqual(llm_runtime.get("estimated_word_count"), 4500)
-        self.assertEqual(llm_runtime.get("chapter_count"), 2)
-        self.assertEqual(llm_runtime.get("profile", {}).get("writingStyle"), "Drifted")
-        self.assertIn("profile_compliance", llm_runtime)
-        self.assertIsInstance(llm_runtime.get("profile_compliance"), dict)
-        self.assertEqual(metadata.get("profile", {}).get("writingStyle"), "Analytical")
-        self.assertEqual(metadata.get("subtitle"), "Original subtitle")
-        self.assertEqual(metadata.get("instruction_brief"), "Keep it practical.")
-        self.assertNotIn("warnings", output)
-
-    @patch("apps.books.services.pipeline.VectorMemoryStore")
-    @patch("apps.books.services.pipeline.LLMService")
-    def test_refine_toc_preserves_user_concept_and_refreshes_llm_runtime(self, mock_llm_cls, mock_store_cls):
-        mock_store_cls.return_value.search_knowledge_base.return_value = []
-        llm = mock_llm_cls.return_value
-        initial_outline = _outline_payload()["outline"]
-        self.project.outline_json = initial_outline
-        self.project.save(update_fields=["outline_json"])
-
-        refine_payload = {
+        llm.generate_outline.return_value = toc_payload
+        llm.refine_outline.return_value = {
             "outline": {
                 "synopsis": "Refined synopsis.",
                 "chapters": [
@@ -101,37 +111,34 @@ class MetadataPreservationTests(TestCase):
             },
             "metadata": {"chapter_count": 2, "themes": ["clarity", "progression"]},
         }
-        llm.refine_outline.return_value = refine_payload
-
-        service = BookWorkflowService()
-        before_user_concept = deepcopy(self.project.metadata_json["user_concept"])
-        output = service.execute_mode(self.project, "refine_toc", {"feedback": "Tighten chapter titles."})
-
-        self.project.refresh_from_db()
-        metadata = self.project.metadata_json
-        self.assertEqual(metadata.get("user_concept"), before_user_concept)
-        llm_runtime = metadata.get("llm_runtime", {})
-        self.assertEqual(llm_runtime.get("chapter_count"), 2)
-        self.assertEqual(llm_runtime.get("themes"), ["clarity", "progression"])
-        self.assertIn("profile_compliance", llm_runtime)
-        self.assertEqual(self.project.outline_json.get("chapters", [])[0].get("title"), "Start Better")
-        self.assertNotIn("warnings", output)
 
-    def test_profile_block_prefers_user_concept_profile_over_legacy_root(self):
-        self.project.metadata_json = {
-            "user_concept": {"profile": {"tone": "Academic", "writingStyle": "Instructional"}},
-            "profile": {"tone": "Humorous", "writingStyle": "Narrative"},
-        }
-        block = _profile_block(self.project)
-        self.assertIn('"tone": "Academic"', block)
-        self.assertIn('"writingStyle": "Instructional"', block)
-        self.assertNotIn('"tone": "Humorous"', block)
-
-    @patch("apps.books.services.pipeline.VectorMemoryStore")
-    @patch("apps.books.services.pipeline.LLMService")
-    def test_toc_adds_outline_profile_compliance_warning_for_count_mismatch(self, mock_llm_cls, mock_store_cls):
-        mock_store_cls.return_value.search_knowledge_base.return_value = []
-        llm = mock_llm_cls.return_value
+        # toc first, then refine_toc on its result: one fixture cycle covers
+        # the preservation guarantee for both modes.
+        for mode, inputs in (("toc", {}), ("refine_toc", {"feedback": "Tighten chapter titles."})):
+            with self.subTest(mode=mode):
+                before_user_concept_json = json.dumps(self.project.metadata_json["user_concept"], sort_keys=True)
+                output = self.service.execute_mode(self.project, mode, inputs)
+
+                project = self._reload("metadata_json", "outline_json")
+                metadata = project.metadata_json
+                self.assertEqual(json.dumps(metadata.get("user_concept"), sort_keys=True), before_user_concept_json)
+                llm_runtime = metadata.get("llm_runtime", {})
+                self.assertEqual(llm_runtime.get("chapter_count"), 2)
+                self.assertIn("profile_compliance", llm_runtime)
+                self.assertIsInstance(llm_runtime.get("profile_compliance"), dict)
+                self.assertNotIn("warnings", output)
+                if mode == "toc":
+                    self.assertEqual(llm_runtime.get("estimated_word_count"), 4500)
+                    self.assertEqual(llm_runtime.get("profile", {}).get("writingStyle"), "Drifted")
+                    self.assertEqual(metadata.get("profile", {}).get("writingStyle"), "Analytical")
+                    self.assertEqual(metadata.get("subtitle"), "Original subtitle")
+                    self.assertEqual(metadata.get("instruction_brief"), "Keep it practical.")
+                else:
+                    self.assertEqual(llm_runtime.get("themes"), ["clarity", "progression"])
+                    self.assertEqual(project.outline_json.get("chapters", [])[0].get("title"), "Start Better")
+
+    def test_toc_adds_outline_profile_compliance_warning_for_count_mismatch(self):
+        llm = self.mock_llm_cls.return_value
         llm.generate_outline.return_value = {
             "outline": {
                 "synopsis": "A practical guide.",
@@ -146,26 +153,21 @@ class MetadataPreservationTests(TestCase):
         }
         self.project.metadata_json["user_concept"]["profile"]["chapterLength"] = "Long ~5000w"
         self.project.metadata_json["user_concept"]["profile"]["length"] = 4500
-        self.project.save(update_fields=["metadata_json"])
+        BookProject.objects.filter(pk=self.project.pk).update(metadata_json=self.project.metadata_json)
 
-        service = BookWorkflowService()
-        output = service.execute_mode(self.project, "toc", {})
+        output = self.service.execute_mode(self.project, "toc", {})
 
         warnings = output.get("warnings", [])
         self.assertTrue(warnings)
         self.assertTrue(any("chapter count may not match" in str(w).lower() for w in warnings))
-        self.project.refresh_from_db()
-        compliance = self.project.metadata_json.get("llm_runtime", {}).get("profile_compliance", {})
+        compliance = self._reload("metadata_json").metadata_json.get("llm_runtime", {}).get("profile_compliance", {})
         self.assertTrue(compliance.get("fail"))
         checks = compliance.get("checks", {}).get("chapter_count_vs_length", {})
         self.assertEqual(checks.get("expected_chapters"), 1)
         self.assertEqual(checks.get("actual_chapters"), 4)
 
-    @patch("apps.books.services.pipeline.VectorMemoryStore")
-    @patch("apps.books.services.pipeline.LLMService")
-    def test_refine_toc_warns_when_feedback_conflicts_with_saved_profile(self, mock_llm_cls, mock_store_cls):
-        mock_store_cls.return_value.search_knowledge_base.return_value = []
-        llm = mock_llm_cls.return_value
+    def test_refine_toc_warns_when_feedback_conflicts_with_saved_profile(self):
+        llm = self.mock_llm_cls.return_value
         self.project.outline_json = _outline_payload()["outline"]
         self.project.metadata_json["user_concept"]["profile"].update(
             {
@@ -177,15 +179,17 @@ class MetadataPreservationTests(TestCase):
                 "length": 4500,
             }
         )
-        self.project.save(update_fields=["outline_json", "metadata_json"])
+        BookProject.objects.filter(pk=self.project.pk).update(
+            outline_json=self.project.outline_json,
+            metadata_json=self.project.metadata_json,
+        )
 
         llm.refine_outline.return_value = {
             "outline": _outline_payload()["outline"],
             "metadata": {"chapter_count": 2},
         }
 
-        service = BookWorkflowService()
-        output = service.execute_mode(
+        output = self.service.execute_mode(
             self.project,
             "refine_toc",
             {
@@ -202,7 +206,22 @@ class MetadataPreservationTests(TestCase):
         self.assertTrue(any("beginner/simple readability" in str(w).lower() for w in warnings))
         self.assertTrue(any("content boundaries" in str(w).lower() for w in warnings))
 
-        self.project.refresh_from_db()
-        analysis = self.project.metadata_json.get("llm_runtime", {}).get("refine_feedback_analysis", {})
+        analysis = self._reload("metadata_json").metadata_json.get("llm_runtime", {}).get("refine_feedback_analysis", {})
         self.assertTrue(analysis.get("warn"))
         self.assertIn("pointOfView", analysis.get("checks", {}))
+
+
+class ProfileBlockUnitTests(SimpleTestCase):
+    """_profile_block only reads metadata_json, so no DB or transaction needed."""
+
+    def test_profile_block_prefers_user_concept_profile_over_legacy_root(self):
+        project = BookProject(
+            metadata_json={
+                "user_concept": {"profile": {"tone": "Academic", "writingStyle": "Instructional"}},
+                "profile": {"tone": "Humorous", "writingStyle": "Narrative"},
+            }
+        )
+        block = _profile_block(project)
+        parsed = json.loads(_PROFILE_JSON_RE.search(block).group(0))
+        self.assertEqual(parsed.get("tone"), "Academic")
+        self.assertEqual(parsed.get("writingStyle"), "Instructional")
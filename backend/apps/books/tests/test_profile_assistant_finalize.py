@@ -3,20 +3,20 @@ from __future__ import annotations
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
-from rest_framework.authtoken.models import Token
-from rest_framework.test import APITestCase
+from django.test import TestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
 
 from apps.books.models import BookProject
 from apps.books.views import BookProjectViewSet
 
 
-class ProfileAssistantFinalizeTests(APITestCase):
-    def setUp(self):
-        self.user = get_user_model().objects.create_user(username="assistant_user", password="pass12345")
-        self.token = Token.objects.create(user=self.user)
-        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
-        self.project = BookProject.objects.create(
-            owner=self.user,
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class ProfileAssistantFinalizeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="assistant_user", password="pass12345")
+        cls.project = BookProject.objects.create(
+            owner=cls.user,
             title="Draft Title",
             genre="Non-fiction",
             target_audience="General readers",
@@ -25,7 +25,34 @@ class ProfileAssistantFinalizeTests(APITestCase):
             target_word_count=3000,
             metadata_json={},
         )
-        self.url = f"/api/books/projects/{self.project.id}/profile-assistant/"
+        cls.url = f"/api/books/projects/{cls.project.id}/profile-assistant/"
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.factory = APIRequestFactory()
+        # as_view returns a plain function; staticmethod stops it from
+        # binding as an instance method when called via self.
+        cls.view = staticmethod(BookProjectViewSet.as_view({"post": "profile_assistant"}))
+        # One persistent patch on the shared viewset LLM; tests just set
+        # the return value instead of opening a context manager each.
+        cls._assist_patch = patch.object(BookProjectViewSet.llm, "assist_profile")
+        cls.mock_assist = cls._assist_patch.start()
+        cls.addClassCleanup(cls._assist_patch.stop)
+
+    def setUp(self):
+        self.mock_assist.reset_mock()
+        self.mock_assist.side_effect = None
+
+    def _post(self, body: dict):
+        """Invoke the viewset action directly, skipping URL dispatch and middleware."""
+        request = self.factory.post(self.url, body, format="json")
+        force_authenticate(request, user=self.user)
+        return self.view(request, pk=self.project.id)
+
+    def _reload(self, *fields: str) -> BookProject:
+        """Re-fetch the project with only the columns a test asserts on."""
+        return BookProject.objects.only(*fields).get(pk=self.project.pk)
 
     def test_non_finalize_response_does_not_apply_field_updates(self):
         payload = {
@@ -35,13 +62,13 @@ class ProfileAssistantFinalizeTests(APITestCase):
             "is_finalized": False,
             "missing_required": ["audience"],
         }
-        with patch.object(BookProjectViewSet.llm, "assist_profile", return_value=payload):
-            response = self.client.post(self.url, {"message": "continue", "current_profile": {}}, format="json")
+        self.mock_assist.return_value = payload
+        response = self._post({"message": "continue", "current_profile": {}})
 
         self.assertEqual(response.status_code, 200)
-        self.project.refresh_from_db()
-        self.assertEqual(self.project.title, "Draft Title")
-        self.assertEqual(self.project.genre, "Non-fiction")
+        project = self._reload("title", "genre")
+        self.assertEqual(project.title, "Draft Title")
+        self.assertEqual(project.genre, "Non-fiction")
 
     def test_finalize_response_applies_project_and_profile_updates(self):
         payload = {
@@ -60,17 +87,17 @@ class ProfileAssistantFinalizeTests(APITestCase):
             "is_finalized": True,
             "missing_required": [],
         }
-        with patch.object(BookProjectViewSet.llm, "assist_profile", return_value=payload):
-            response = self.client.post(self.url, {"message": "finalize", "current_profile": {}}, format="json")
+        self.mock_assist.return_value = payload
+        response = self._post({"message": "finalize", "current_profile": {}})
 
         self.assertEqual(response.status_code, 200)
-        self.project.refresh_from_db()
-        self.assertEqual(self.project.title, "Applied Title")
-        self.assertEqual(self.project.genre, "Education")
-        self.assertEqual(self.project.target_audience, "University students")
-        self.assertEqual(self.project.tone, "Academic")
-        self.assertEqual(self.project.target_word_count, 4200)
-        user_profile = self.project.metadata_json.get("user_concept", {}).get("profile", {})
+        project = self._reload("title", "genre", "target_audience", "tone", "target_word_count", "metadata_json")
+        self.assertEqual(project.title, "Applied Title")
+        self.assertEqual(project.genre, "Education")
+        self.assertEqual(project.target_audience, "University students")
+        self.assertEqual(project.tone, "Academic")
+        self.assertEqual(project.target_word_count, 4200)
+        user_profile = project.metadata_json.get("user_concept", {}).get("profile", {})
         self.assertEqual(user_profile.get("writingStyle"), "Instructional")
         self.assertEqual(user_profile.get("pointOfView"), "Second Person")
 
@@ -82,9 +109,8 @@ class ProfileAssistantFinalizeTests(APITestCase):
             "is_finalized": False,
             "missing_required": ["genre"],
         }
-        with patch.object(BookProjectViewSet.llm, "assist_profile", return_value=payload):
-            response = self.client.post(self.url, {"message": "finalize", "current_profile": {}}, format="json")
+        self.mock_assist.return_value = payload
+        response = self._post({"message": "finalize", "current_profile": {}})
 
         self.assertEqual(response.status_code, 200)
-        self.project.refresh_from_db()
-        self.assertEqual(self.project.title, "Draft Title")
+        self.assertEqual(self._reload("title").title, "Draft Title")
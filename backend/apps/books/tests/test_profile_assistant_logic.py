@@ -10,28 +10,42 @@ from apps.books.services.llm import (
 )
 
 
+# Built once at import; every value is an immutable str/int, so tests can
+# mutate their shallow copy freely.
+_BASE_PROFILE_TEMPLATE = {
+    "title": "",
+    "genre": "Non-fiction",
+    "language": "English",
+    "length": 3000,
+    "publishingIntent": "Self-publish",
+    "audience": "General readers",
+    "audienceKnowledgeLevel": "Complete Beginner",
+    "bookPurpose": "Teach a Skill",
+    "tone": "Informative",
+    "writingStyle": "Instructional",
+    "pointOfView": "Second Person",
+    "sentenceRhythm": "Mixed",
+    "vocabularyLevel": "Intermediate",
+    "chapterLength": "Medium ~3000w",
+}
+
+
 def _base_profile() -> dict:
-    return {
-        "title": "",
-        "genre": "Non-fiction",
-        "language": "English",
-        "length": 3000,
-        "publishingIntent": "Self-publish",
-        "audience": "General readers",
-        "audienceKnowledgeLevel": "Complete Beginner",
-        "bookPurpose": "Teach a Skill",
-        "tone": "Informative",
-        "writingStyle": "Instructional",
-        "pointOfView": "Second Person",
-        "sentenceRhythm": "Mixed",
-        "vocabularyLevel": "Intermediate",
-        "chapterLength": "Medium ~3000w",
-    }
+    return _BASE_PROFILE_TEMPLATE.copy()
+
+
+def _profile_with(**overrides) -> dict:
+    """Base profile merged with overrides in one C-level dict merge."""
+    return _BASE_PROFILE_TEMPLATE | overrides
 
 
 class ProfileAssistantLogicTests(SimpleTestCase):
-    def setUp(self):
-        self.llm = LLMService()
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # The normalizer keeps no per-call instance state, so one service
+        # serves the whole session.
+        cls.llm = LLMService.get_shared()
 
     def test_missing_required_treats_placeholder_title_as_missing(self):
         profile = _base_profile()
@@ -129,8 +143,7 @@ class ProfileAssistantLogicTests(SimpleTestCase):
         self.assertIn("book title", normalized["assistant_reply"].lower())
 
     def test_normalizer_trusts_valid_llm_next_field_even_if_not_first_missing(self):
-        current_profile = _base_profile()
-        current_profile.update({"title": "", "genre": "", "language": ""})
+        current_profile = _profile_with(title="", genre="", language="")
         payload = {
             "assistant_reply": "What genre fits best?",
             "field_updates": {},
@@ -150,8 +163,7 @@ class ProfileAssistantLogicTests(SimpleTestCase):
         self.assertIn("genre", normalized["missing_required"])
 
     def test_normalizer_advances_when_model_points_to_field_just_captured(self):
-        current_profile = _base_profile()
-        current_profile.update({"title": "AI for Kids", "genre": "", "language": ""})
+        current_profile = _profile_with(title="AI for Kids", genre="", language="")
         payload = {
             "assistant_reply": "Great, education genre works. Next?",
             "field_updates": {"genre": "Education"},
@@ -219,8 +231,7 @@ class ProfileAssistantLogicTests(SimpleTestCase):
         self.assertNotIn("Move on to chapter length", normalized["suggestions"])
 
     def test_optional_batch_is_deferred_in_early_conversation(self):
-        current_profile = _base_profile()
-        current_profile["title"] = "AI for Kids"
+        current_profile = _profile_with(title="AI for Kids")
         payload = {
             "assistant_reply": "We can finalize now if you want.",
             "field_updates": {},
@@ -247,8 +258,7 @@ class ProfileAssistantLogicTests(SimpleTestCase):
         self.assertNotIn("optional details", normalized["assistant_reply"].lower())
 
     def test_keep_defaults_intent_finalizes_when_required_fields_complete(self):
-        current_profile = _base_profile()
-        current_profile["title"] = "Basics of Agentic AI"
+        current_profile = _profile_with(title="Basics of Agentic AI")
         payload = {
             "assistant_reply": "We have the core brief. Before finalizing, we can add optional details.",
             "field_updates": {},
@@ -268,8 +278,7 @@ class ProfileAssistantLogicTests(SimpleTestCase):
         self.assertEqual(normalized["next_field"], "")
 
     def test_field_question_returns_explanation_and_keeps_form_context(self):
-        current_profile = _base_profile()
-        current_profile["title"] = "AI Basics"
+        current_profile = _profile_with(title="AI Basics")
         payload = {
             "assistant_reply": "Would you like to finalize?",
             "field_updates": {},
@@ -290,8 +299,7 @@ class ProfileAssistantLogicTests(SimpleTestCase):
         self.assertIn("pages before chapter 1", normalized["assistant_reply"].lower())
 
     def test_add_more_details_advances_to_specific_optional_field_instead_of_looping(self):
-        current_profile = _base_profile()
-        current_profile["title"] = "AI Basics"
+        current_profile = _profile_with(title="AI Basics")
         long_conversation = [
             {"role": "assistant", "content": "Hi"},
             {"role": "user", "content": "AI Basics"},
@@ -321,8 +329,7 @@ class ProfileAssistantLogicTests(SimpleTestCase):
         self.assertNotIn("we have the core brief", normalized["assistant_reply"].lower())
 
     def test_required_field_sequence_overrides_optional_next_field_when_required_missing(self):
-        current_profile = _base_profile()
-        current_profile.update({"title": "", "genre": ""})
+        current_profile = _profile_with(title="", genre="")
         payload = {
             "assistant_reply": "Would you like to add a subtitle?",
             "field_updates": {},
@@ -348,8 +355,7 @@ class ProfileAssistantLogicTests(SimpleTestCase):
         self.assertEqual(_normalize_profile_value("tone", "educational"), "Informative")
 
     def test_semantic_repair_moves_instructional_from_tone_to_writing_style(self):
-        current_profile = _base_profile()
-        current_profile["title"] = "Time Management for Beginners"
+        current_profile = _profile_with(title="Time Management for Beginners")
         payload = {
             "assistant_reply": "Got it. What length are you aiming for?",
             "field_updates": {"tone": "instructional"},
@@ -369,8 +375,7 @@ class ProfileAssistantLogicTests(SimpleTestCase):
         self.assertNotIn("tone", normalized["field_updates"])
 
     def test_finalize_is_idempotent_after_recent_finalize(self):
-        current_profile = _base_profile()
-        current_profile["title"] = "Time Management for Beginners"
+        current_profile = _profile_with(title="Time Management for Beginners")
         payload = {
             "assistant_reply": "We can add optional details before finalizing.",
             "field_updates": {},
@@ -468,8 +473,7 @@ class ProfileAssistantLogicTests(SimpleTestCase):
         self.assertEqual(normalized["suggestions"], [])
 
     def test_bare_field_label_is_treated_as_help_request(self):
-        current_profile = _base_profile()
-        current_profile["title"] = "Time Management for Beginners"
+        current_profile = _profile_with(title="Time Management for Beginners")
         payload = {
             "assistant_reply": "Would you like to finalize?",
             "field_updates": {},
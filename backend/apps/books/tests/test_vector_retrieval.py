@@ -27,11 +27,15 @@ class _InMemoryVectorClient:
         self.points.extend(points)
 
     def search(self, collection_name, query_vector, query_filter, limit, with_payload):
-        must_conditions = list(getattr(query_filter, "must", []) or [])
+        # Extract (key, expected) pairs once instead of per stored point.
+        conditions = [
+            (str(getattr(cond, "key", "")).strip(), getattr(getattr(cond, "match", None), "value", None))
+            for cond in (getattr(query_filter, "must", []) or [])
+        ]
         out = []
         for point in self.points:
             payload = getattr(point, "payload", {}) or {}
-            if _payload_matches(payload, must_conditions):
+            if all(payload.get(key) == expected for key, expected in conditions):
                 out.append(_Hit(payload=payload, score=0.91))
         return out[:limit]
 
@@ -44,15 +48,6 @@ class _StaticSearchClient:
         return self.hits[:limit]
 
 
-def _payload_matches(payload, conditions):
-    for cond in conditions:
-        key = str(getattr(cond, "key", "")).strip()
-        expected = getattr(getattr(cond, "match", None), "value", None)
-        if payload.get(key) != expected:
-            return False
-    return True
-
-
 class VectorRetrievalTests(TestCase):
     def setUp(self):
         if vector_store_module.qmodels is None:
@@ -2,26 +2,52 @@ from __future__ import annotations
 
 from typing import Any, Dict
 
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils.functional import classproperty
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
 
 from .models import BookProject, Chapter, SourceDocument
-from .serializers import BookProjectSerializer, ChapterSerializer, SourceDocumentSerializer
+from .serializers import (
+    BookProjectSerializer,
+    ChapterListSerializer,
+    ChapterSerializer,
+    SourceDocumentListSerializer,
+    SourceDocumentSerializer,
+)
 from .services.knowledge_base import extract_knowledge_text, index_source_document
 from .services.llm import LLMService
+from .services.pipeline import apply_profile_updates_if_finalized
+from .tasks import index_source_document_task
+
+
+def _wants_sync(request) -> bool:
+    """Mirror the agents API: ?sync=1 runs work inline instead of via Celery."""
+    return str(request.query_params.get("sync", "0")).lower() in {"1", "true", "yes"}
 
 
 class BookProjectViewSet(viewsets.ModelViewSet):
     queryset = BookProject.objects.none()
     serializer_class = BookProjectSerializer
-    llm = LLMService()
+
+    @classproperty
+    def llm(cls):
+        # Deferred so importing the views module (health checks, migrations,
+        # management commands) doesn't pay LLM client construction.
+        return LLMService.get_shared()
 
     def get_queryset(self):
         return (
             BookProject.objects.filter(owner=self.request.user)
-            .prefetch_related("chapters", "sources")
+            .prefetch_related(
+                # Nested serializers are the slim variants, so the prefetch
+                # can leave each child's text body in the database.
+                Prefetch("chapters", queryset=Chapter.objects.defer("content")),
+                Prefetch("sources", queryset=SourceDocument.objects.defer("content")),
+            )
             .order_by("-created_at")
         )
 
@@ -32,10 +58,12 @@ class BookProjectViewSet(viewsets.ModelViewSet):
     def chapters(self, request, pk=None):
         project = self.get_object()
         if request.method == "GET":
-            serializer = ChapterSerializer(project.chapters.all(), many=True)
+            serializer = ChapterListSerializer(project.chapters.all(), many=True)
             return Response(serializer.data)
 
-        payload = request.data.copy()
+        # Shallow spread instead of QueryDict.copy(): we only inject one key,
+        # and copy() duplicates every value (including file lists).
+        payload = dict(request.data.items())
         payload["project"] = str(project.id)
         serializer = ChapterSerializer(data=payload, context={"request": request})
         serializer.is_valid(raise_exception=True)
@@ -46,17 +74,24 @@ class BookProjectViewSet(viewsets.ModelViewSet):
     def sources(self, request, pk=None):
         project = self.get_object()
         if request.method == "GET":
-            serializer = SourceDocumentSerializer(project.sources.all(), many=True)
+            serializer = SourceDocumentListSerializer(project.sources.all(), many=True)
             return Response(serializer.data)
 
-        payload = request.data.copy()
+        payload = dict(request.data.items())
         payload["project"] = str(project.id)
         serializer = SourceDocumentSerializer(data=payload, context={"request": request})
         serializer.is_valid(raise_exception=True)
         source = serializer.save(project=project)
-        index_stats = index_source_document(source)
-        data = SourceDocumentSerializer(source).data
-        data["index_stats"] = index_stats
+        # Reuse the bound serializer instead of a second full field walk.
+        data = dict(serializer.data)
+        if _wants_sync(request):
+            data["index_stats"] = index_source_document(source)
+        else:
+            # Queue only after the row is committed so the worker can't
+            # look up the document before it exists.
+            source_id = str(source.id)
+            transaction.on_commit(lambda: index_source_document_task.delay(source_id))
+            data["index_status"] = "queued"
         return Response(data, status=status.HTTP_201_CREATED)
 
     @action(
@@ -88,9 +123,13 @@ class BookProjectViewSet(viewsets.ModelViewSet):
                 "priority": str(request.data.get("priority", "supporting")).strip().lower() or "supporting",
             },
         )
-        index_stats = index_source_document(source)
         data = SourceDocumentSerializer(source).data
-        data["index_stats"] = index_stats
+        if _wants_sync(request):
+            data["index_stats"] = index_source_document(source)
+        else:
+            source_id = str(source.id)
+            transaction.on_commit(lambda: index_source_document_task.delay(source_id))
+            data["index_status"] = "queued"
         return Response(data, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=["post"], url_path="profile-assistant")
@@ -113,63 +152,24 @@ class BookProjectViewSet(viewsets.ModelViewSet):
             conversation=conversation,
             user_message=message,
         )
-        self._apply_profile_updates_if_finalized(project, payload)
+        apply_profile_updates_if_finalized(project, payload)
         return Response(payload)
 
-    def _apply_profile_updates_if_finalized(self, project: BookProject, payload: Dict[str, Any]) -> None:
-        if not isinstance(payload, dict):
-            return
-        if not bool(payload.get("is_finalized")):
-            return
-
-        updates = payload.get("field_updates", {})
-        if not isinstance(updates, dict) or not updates:
-            return
-
-        project_updates: Dict[str, Any] = {}
-        if isinstance(updates.get("title"), str) and updates["title"].strip():
-            project_updates["title"] = updates["title"].strip()[:160]
-        if isinstance(updates.get("genre"), str) and updates["genre"].strip():
-            project_updates["genre"] = updates["genre"].strip()[:80]
-        if isinstance(updates.get("audience"), str) and updates["audience"].strip():
-            project_updates["target_audience"] = updates["audience"].strip()[:80]
-        if isinstance(updates.get("language"), str) and updates["language"].strip():
-            project_updates["language"] = updates["language"].strip()[:40]
-        if isinstance(updates.get("tone"), str) and updates["tone"].strip():
-            project_updates["tone"] = updates["tone"].strip()[:80]
-        if "length" in updates:
-            try:
-                project_updates["target_word_count"] = max(300, int(float(str(updates["length"]).strip())))
-            except Exception:
-                pass
-
-        raw_meta = project.metadata_json if isinstance(project.metadata_json, dict) else {}
-        user_concept = raw_meta.get("user_concept", {})
-        if not isinstance(user_concept, dict):
-            user_concept = {}
-        profile = user_concept.get("profile", {})
-        if not isinstance(profile, dict):
-            profile = {}
-        profile.update({str(k): v for k, v in updates.items()})
-        user_concept["profile"] = profile
-
-        new_meta = dict(raw_meta)
-        new_meta["user_concept"] = user_concept
-        new_meta["profile"] = profile
-        project_updates["metadata_json"] = new_meta
-
-        if project_updates:
-            for field, value in project_updates.items():
-                setattr(project, field, value)
-            project.save(update_fields=list(project_updates.keys()) + ["updated_at"])
-
 
 class ChapterViewSet(viewsets.ModelViewSet):
     queryset = Chapter.objects.none()
     serializer_class = ChapterSerializer
 
+    def get_serializer_class(self):
+        if self.action == "list":
+            return ChapterListSerializer
+        return ChapterSerializer
+
     def get_queryset(self):
         qs = Chapter.objects.select_related("project").filter(project__owner=self.request.user)
+        if self.action == "list":
+            # The list serializer skips the body, so don't fetch the blob.
+            qs = qs.defer("content")
         project_id = self.request.query_params.get("project_id")
         if project_id:
             qs = qs.filter(project_id=project_id)
@@ -178,13 +178,34 @@ class ChapterViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save()
 
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """Persist a list of chapters in one INSERT instead of N round trips."""
+        serializer = ChapterSerializer(data=request.data, many=True, context={"request": request})
+        serializer.is_valid(raise_exception=True)
+        chapters = Chapter.objects.bulk_create(
+            [Chapter(**item) for item in serializer.validated_data],
+            batch_size=100,
+        )
+        return Response(
+            ChapterListSerializer(chapters, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
 
 class SourceDocumentViewSet(viewsets.ModelViewSet):
     queryset = SourceDocument.objects.none()
     serializer_class = SourceDocumentSerializer
 
+    def get_serializer_class(self):
+        if self.action == "list":
+            return SourceDocumentListSerializer
+        return SourceDocumentSerializer
+
     def get_queryset(self):
         qs = SourceDocument.objects.select_related("project").filter(project__owner=self.request.user)
+        if self.action == "list":
+            qs = qs.defer("content")
         project_id = self.request.query_params.get("project_id")
         if project_id:
             qs = qs.filter(project_id=project_id)
@@ -192,4 +213,8 @@ class SourceDocumentViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         source = serializer.save()
-        index_source_document(source)
+        if _wants_sync(self.request):
+            index_source_document(source)
+        else:
+            source_id = str(source.id)
+            transaction.on_commit(lambda: index_source_document_task.delay(source_id))
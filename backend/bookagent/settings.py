@@ -107,8 +107,18 @@ OPENAI_FAST_MODEL = os.getenv("OPENAI_FAST_MODEL", "gpt-4o-mini")
 OPENAI_EMBED_MODEL = os.getenv("OPENAI_EMBED_MODEL", "text-embedding-3-large")
 OPENAI_IMAGE_MODEL = os.getenv("OPENAI_IMAGE_MODEL", "gpt-image-1")
 
+# Thread-pool width for embedding texts when no batch embeddings API is
+# available on the configured LLM adapter.
+EMBEDDING_CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY", "8"))
+
 QDRANT_URL = os.getenv("QDRANT_URL", "http://127.0.0.1:6333")
 QDRANT_API_KEY = os.getenv("QDRANT_API_KEY", "")
 QDRANT_COLLECTION = os.getenv("QDRANT_COLLECTION", "book_memory")
+QDRANT_PREFER_GRPC = _bool_env("QDRANT_PREFER_GRPC", True)
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
 
 BOOK_AGENT_JSON_RETRIES = int(os.getenv("BOOK_AGENT_JSON_RETRIES", "2"))
+
+# Render PDF and DOCX in separate processes when exporting "both".
+# Off by default: process spawn is not free on every deployment target.
+EXPORT_PARALLEL_RENDER = _bool_env("EXPORT_PARALLEL_RENDER", False)
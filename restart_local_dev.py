@@ -1,5 +1,6 @@
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
@@ -13,55 +14,78 @@ FRONTEND_LOG = FRONTEND_DIR / "frontend_dev.log"
 DETACHED_FLAGS = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
 
 
-def kill_port(port: int) -> None:
+def kill_ports(ports: set[int]) -> None:
+    # One netstat snapshot covers every port; the old per-port
+    # cmd /c "netstat | findstr" pipeline paid two process spawns per
+    # port before either dev server could start.
     result = subprocess.run(
-        ["cmd", "/c", f"netstat -ano | findstr :{port}"],
+        ["netstat", "-ano"],
         capture_output=True,
         text=True,
         check=False,
     )
+    wanted = {str(port) for port in ports}
     pids = set()
     for line in result.stdout.splitlines():
         parts = line.split()
-        if len(parts) >= 5 and parts[-1].isdigit():
-            pids.add(parts[-1])
+        if len(parts) >= 4 and parts[-1].isdigit():
+            local_port = parts[1].rsplit(":", 1)[-1]
+            if local_port in wanted:
+                pids.add(parts[-1])
     for pid in sorted(pids):
         subprocess.run(["taskkill", "/F", "/PID", pid], check=False, capture_output=True, text=True)
 
 
+def _open_log(path: Path) -> int:
+    # Raw append-mode fd: keeps history across restarts (mode "w"
+    # truncated it), gives the child OS-level append writes with no
+    # parent-side TextIOWrapper, and Popen dups it so the parent can
+    # close its copy instead of leaking the handle.
+    return os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_APPEND)
+
+
 def spawn_backend() -> None:
-    log_file = open(BACKEND_LOG, "w", encoding="utf-8")
-    subprocess.Popen(
-        ["python", "manage.py", "runserver", "127.0.0.1:8000"],
-        cwd=str(BACKEND_DIR),
-        stdout=log_file,
-        stderr=subprocess.STDOUT,
-        creationflags=DETACHED_FLAGS,
-        close_fds=True,
-    )
+    fd = _open_log(BACKEND_LOG)
+    try:
+        subprocess.Popen(
+            ["python", "manage.py", "runserver", "127.0.0.1:8000"],
+            cwd=str(BACKEND_DIR),
+            stdout=fd,
+            stderr=subprocess.STDOUT,
+            creationflags=DETACHED_FLAGS,
+            close_fds=True,
+        )
+    finally:
+        os.close(fd)
 
 
 def spawn_frontend() -> None:
     env = os.environ.copy()
     env["VITE_API_BASE_URL"] = "http://127.0.0.1:8000/api"
-    log_file = open(FRONTEND_LOG, "w", encoding="utf-8")
-    subprocess.Popen(
-        ["cmd", "/c", "npm run dev -- --host 127.0.0.1 --port 5174"],
-        cwd=str(FRONTEND_DIR),
-        env=env,
-        stdout=log_file,
-        stderr=subprocess.STDOUT,
-        creationflags=DETACHED_FLAGS,
-        close_fds=True,
-    )
+    fd = _open_log(FRONTEND_LOG)
+    try:
+        subprocess.Popen(
+            ["cmd", "/c", "npm run dev -- --host 127.0.0.1 --port 5174"],
+            cwd=str(FRONTEND_DIR),
+            env=env,
+            stdout=fd,
+            stderr=subprocess.STDOUT,
+            creationflags=DETACHED_FLAGS,
+            close_fds=True,
+        )
+    finally:
+        os.close(fd)
 
 
 def main() -> None:
-    kill_port(8000)
-    kill_port(5174)
-    kill_port(8010)
-    spawn_backend()
-    spawn_frontend()
+    # Ports must be free before the servers bind, but the two spawns are
+    # independent of each other, so launch them side by side.
+    kill_ports({8000, 5174, 8010})
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        backend = pool.submit(spawn_backend)
+        frontend = pool.submit(spawn_frontend)
+        backend.result()
+        frontend.result()
     print("Restarted backend (8000) and frontend (5174).")
 
 